@@ -5,11 +5,19 @@
 #   - All Connected (on used vertices)
 #   - Valid Incomplete (connected and no full triangular face)
 #
-# Usage: python platonic_counts.py
+# Usage: python platonic_counts.py [--solids tetrahedron,cube] [--engine dfs|enumerate]
+#                                  [--group graph|numeric] [--split-square-faces]
+#                                  [--checkpoint FILE [--resume]] [--checkpoint-interval SEC]
+#
+# As a library nothing is computed at import time; each solid's geometry
+# and rotation group is built on first use and cached:
+#   import platonic_counts as pc
+#   pc.count(pc.solid("octahedron"))          # (218, 193, 80)
+#   len(pc.rotation_group("icosahedron"))     # 60
 #
 # Requirements: Python 3.x, numpy, (optional) pandas for pretty table
 
-import itertools, math, numpy as np, time
+import argparse, collections, functools, hashlib, itertools, json, math, os, numpy as np, time
 
 def normalize(v):
     v = np.array(v, dtype=float)
@@ -29,10 +37,29 @@ def rot_axis_angle(axis, theta):
 def is_rot(R):
     return np.allclose(R.T@R, np.eye(3), atol=1e-8) and np.isclose(np.linalg.det(R),1.0,atol=1e-8)
 
-def nearest_index(p, V, tol=1e-5):
-    for i,v in enumerate(V):
-        if np.linalg.norm(p-v) < tol: return i
-    return None
+def vertex_hash(V, decimals=5):
+    # rounded coordinates -> vertex index; each vertex goes in under every
+    # floor/ceil combination so a nearby image hits whichever way it rounds
+    table={}
+    for i,key in enumerate(np.floor(np.asarray(V,dtype=float)*10.0**decimals).astype(np.int64).tolist()):
+        for bump in itertools.product((0,1), repeat=len(key)):
+            table[tuple(k+b for k,b in zip(key,bump))]=i
+    return table
+
+def vperms_from_rotations(V, Rs, decimals=5, table=None):
+    # vertex perms for a (k,3,3) stack of rotations: all images in one einsum,
+    # matched through vertex_hash (vertex 0 first, so non-symmetries are
+    # dropped after one lookup); None where an image is not a vertex
+    V=np.asarray(V,dtype=float)
+    if table is None: table=vertex_hash(V, decimals)
+    imgs=np.einsum('kij,nj->kni', np.asarray(Rs,dtype=float).reshape(-1,3,3), V)
+    keys=np.rint(imgs*10.0**decimals).astype(np.int64)
+    out=[None]*len(keys)
+    for k,first in enumerate(keys[:,0].tolist()):
+        if tuple(first) in table:
+            p=tuple(map(table.get, map(tuple, keys[k].tolist())))
+            if None not in p: out[k]=p
+    return out
 
 def dedup_perms(perms):
     seen = set(); out=[]
@@ -61,205 +88,428 @@ def cycles_of_perm(perm):
     return cyc
 
 def connected_on_used(nV, subset_edges):
-    used = sorted(set([u for e in subset_edges for u in e]))
-    if not used: return True
-    idmap={v:i for i,v in enumerate(used)}
-    g=[set() for _ in used]
+    # bit-parallel BFS: per-vertex neighbor bitmasks, grow reach by OR-ing
+    # the neighbors of the newest frontier until it stops changing
+    nbr=[0]*nV; used=0
     for a,b in subset_edges:
-        ia,ib=idmap[a],idmap[b]
-        g[ia].add(ib); g[ib].add(ia)
-    seen={0}; stack=[0]
-    while stack:
-        u=stack.pop()
-        for w in g[u]:
-            if w not in seen: seen.add(w); stack.append(w)
-    return len(seen)==len(used)
-
-def contains_triangle(subset_edges, tri_faces):
-    E=set(tuple(sorted(e)) for e in subset_edges)
+        nbr[a] |= 1<<b; nbr[b] |= 1<<a
+        used |= (1<<a)|(1<<b)
+    if not used: return True
+    reach=frontier=used & -used
+    while frontier:
+        grown=0
+        while frontier:
+            low=frontier & -frontier
+            grown |= nbr[low.bit_length()-1]
+            frontier ^= low
+        frontier=grown & ~reach
+        reach |= frontier
+    return reach==used
+
+def triangle_mask_table(E, tri_faces):
+    # one uint64 edge mask per triangular face; halves of a split square
+    # (CubF_tri) that share a missing diagonal become the square's 4 edges
+    idx={tuple(sorted(e)):i for i,e in enumerate(E)}
+    masks=[]; halves={}
     for a,b,c in tri_faces:
-        if (tuple(sorted((a,b))) in E and
-            tuple(sorted((b,c))) in E and
-            tuple(sorted((c,a))) in E):
-            return True
-    return False
-
-def burnside_counts(V, E, edge_perms, tri_faces, solid_name=""):
+        keys=[tuple(sorted(p)) for p in ((a,b),(b,c),(c,a))]
+        have=[idx[k] for k in keys if k in idx]
+        if len(have)==3:
+            masks.append(sum(1<<i for i in have))
+        elif len(have)==2:
+            diag=[k for k in keys if k not in idx][0]
+            halves.setdefault(diag,[]).append(sum(1<<i for i in have))
+    masks += [h[0]|h[1] for h in halves.values() if len(h)==2]
+    return np.array(masks, dtype=np.uint64)
+
+def dfs_connected_counts(nV, cyc_edges, cycmasks, tri_table, split=0, unit=0):
+    # With split>0 only the subsets whose choice of the first `split` cycles
+    # is given by the bits of `unit` are counted; the 2^split units add up
+    # to the full count and can be checkpointed one by one.
+    # DFS over the subset lattice of the cycles: every node is one subset and
+    # adds a single cycle (index above its parent's) to a rollback union-find.
+    # Used-vertex and merge counts are carried along, so "connected on used
+    # vertices" is an O(1) test (used - merges == 1) at each node.
+    # Containing a triangle is upward-closed: below a node that closes one
+    # nothing is valid any more, and once such a node is connected with every
+    # remaining edge touching its vertices, all its supersets are connected
+    # too and the subtree is counted in bulk.
+    parent=list(range(nV)); size=[1]*nV; deg=[0]*nV
+    c=len(cyc_edges)
+    tris=[int(t) for t in tri_table]
+    cyc_tris=[[t for t in tris if t & cm] for cm in cycmasks]
+    cycvmasks=[sum(1<<v for v in {x for e in ce for x in e}) for ce in cyc_edges]
+    suffix_edges=[[(1<<a)|(1<<b) for ce in cyc_edges[i:] for a,b in ce] for i in range(c+1)]
+
+    def find(x):
+        while parent[x]!=x: x=parent[x]
+        return x
+
+    def visit(start, used, merges, emask, vmask, closed):
+        nonlocal conn, valid
+        for i in range(start, c):
+            undo=[]; u=used; m=merges
+            for a,b in cyc_edges[i]:
+                if deg[a]==0: u+=1
+                if deg[b]==0: u+=1
+                deg[a]+=1; deg[b]+=1
+                ra,rb=find(a),find(b)
+                if ra!=rb:
+                    if size[ra]<size[rb]: ra,rb=rb,ra
+                    parent[rb]=ra; size[ra]+=size[rb]
+                    undo.append((ra,rb)); m+=1
+            em=emask|cycmasks[i]; vm=vmask|cycvmasks[i]
+            cl=closed or any(em & t == t for t in cyc_tris[i])
+            bulk=False
+            if u-m==1:
+                conn+=1
+                if not cl:
+                    valid+=1
+                elif all(x & vm for x in suffix_edges[i+1]):
+                    conn+=(1<<(c-1-i))-1; bulk=True
+            if not bulk:
+                visit(i+1, u, m, em, vm, cl)
+            for ra,rb in reversed(undo):
+                parent[rb]=rb; size[ra]-=size[rb]
+            for a,b in cyc_edges[i]:
+                deg[a]-=1; deg[b]-=1
+
+    # the unit's root: its fixed prefix cycles, joined for good
+    used=merges=emask=vmask=0
+    for i in range(split):
+        if not unit>>i & 1: continue
+        for a,b in cyc_edges[i]:
+            if deg[a]==0: used+=1
+            if deg[b]==0: used+=1
+            deg[a]+=1; deg[b]+=1
+            ra,rb=find(a),find(b)
+            if ra!=rb:
+                if size[ra]<size[rb]: ra,rb=rb,ra
+                parent[rb]=ra; size[ra]+=size[rb]; merges+=1
+        emask|=cycmasks[i]; vmask|=cycvmasks[i]
+    closed=any(emask & t == t for t in tris)
+    conn=valid=0
+    if used-merges==1 or used==0:   # the root subset itself (maybe empty)
+        conn=1; valid=0 if closed else 1
+        if closed and used and all(x & vmask for x in suffix_edges[split]):
+            return conn+(1<<(c-split))-1, valid
+    visit(split, used, merges, emask, vmask, closed)
+    return conn, valid
+
+def enumerate_connected_counts(nV, cyc_edges, cycmasks, tri_table):
+    # plain 2^c enumeration of the cycle unions, one BFS each; only feasible
+    # for small c, kept as a cross-check of dfs_connected_counts
+    tris=[int(t) for t in tri_table]
+    c=len(cyc_edges); conn=0; valid=0
+    for sel in range(1<<c):
+        em=0; sub=[]
+        for i in range(c):
+            if sel>>i & 1:
+                em|=cycmasks[i]; sub+=cyc_edges[i]
+        if connected_on_used(nV, sub):
+            conn+=1
+            if not any(em & t == t for t in tris): valid+=1
+    return conn, valid
+
+# elements with more cycles are checkpointed in 2^(c-UNIT_BITS) DFS units
+UNIT_BITS=20
+
+ENGINES={"dfs": dfs_connected_counts, "enumerate": enumerate_connected_counts}
+
+def load_checkpoint(path):
+    # {element key: [conn, valid]}; missing file = nothing done yet
+    if not os.path.exists(path): return {}
+    with open(path) as f: return json.load(f)
+
+def save_checkpoint(path, done):
+    # write-then-rename, so a crash mid-write keeps the previous checkpoint
+    tmp=path+".tmp"
+    with open(tmp,"w") as f:
+        json.dump(done,f); f.flush(); os.fsync(f.fileno())
+    os.replace(tmp,path)
+
+def burnside_counts(V, E, edge_perms, tri_faces, solid_name="",
+                    ckpt=None, ckpt_path=None, ckpt_every=60.0,
+                    engine="dfs", verbose=True):
+    # ckpt: dict of finished elements (see load_checkpoint), keyed by a hash
+    # of (E, tri_faces, perm); new results are added and flushed to
+    # ckpt_path at most every ckpt_every seconds. With the dfs engine an
+    # element of more than UNIT_BITS cycles (the hours-long 30-cycle
+    # identities) is split into 2^(c-UNIT_BITS) prefix units, each recorded
+    # under "key:split:unit" as it finishes, so an interrupted run resumes
+    # inside the element.
+    count_fixed=ENGINES[engine]
+    log=print if verbose else (lambda *a: None)
     nV=len(V); mE=len(E)
     idx={tuple(sorted(e)):i for i,e in enumerate(E)}
     cycsets_per_perm = []
     
-    print(f"Computing cycles for {solid_name}...")
+    log(f"Computing cycles for {solid_name}...")
     for i, perm in enumerate(edge_perms):
         if i % 10 == 0:
-            print(f"  Processing permutation {i+1}/{len(edge_perms)}")
+            log(f"  Processing permutation {i+1}/{len(edge_perms)}")
         cyc = cycles_of_perm(perm)
         cycsets=[set(E[i] for i in c) for c in cyc]
         cycsets_per_perm.append(cycsets)
 
-    print(f"Computing subset counts for {solid_name}...")
-    tot_all=0; tot_conn=0; tot_valid=0
+    log(f"Computing subset counts for {solid_name}...")
+    tri_table=triangle_mask_table(E, tri_faces)
+    tot_all=0; tot_conn=0; tot_valid=0; last_save=time.time()
     for perm_idx, cycsets in enumerate(cycsets_per_perm):
         if perm_idx % 10 == 0:
-            print(f"  Processing permutation {perm_idx+1}/{len(cycsets_per_perm)}")
+            log(f"  Processing permutation {perm_idx+1}/{len(cycsets_per_perm)}")
         c=len(cycsets)
         tot_all += 2**c
-        # enumerate unions of cycles (2^c per perm)
-        conn=0; valid=0
-        total_subsets = 1<<c
-        for mask in range(total_subsets):
-            if mask % 1000000 == 0 and mask > 0:
-                print(f"    Subset {mask}/{total_subsets}")
-            subset=set()
-            for i in range(c):
-                if (mask>>i)&1:
-                    subset |= cycsets[i]
-            subset_edges=sorted(subset)
-            if connected_on_used(nV, subset_edges):
-                conn += 1
-                if not contains_triangle(subset_edges, tri_faces):
-                    valid += 1
+        key=hashlib.sha256(repr((list(E), list(tri_faces), list(edge_perms[perm_idx]))).encode()).hexdigest()
+        if ckpt is not None and key in ckpt:
+            conn, valid = ckpt[key]
+        else:
+            # enumerate unions of cycles (2^c per perm); the dfs engine goes
+            # depth-first, pruning subtrees that already contain a triangle
+            cycmasks=[sum(1<<idx[e] for e in cs) for cs in cycsets]
+            cyc_edges=[sorted(cs) for cs in cycsets]
+            split=max(0, c-UNIT_BITS) if (ckpt is not None and engine=="dfs") else 0
+            if split==0:
+                conn, valid = count_fixed(nV, cyc_edges, cycmasks, tri_table)
+            else:
+                conn=valid=0
+                for unit in range(1<<split):
+                    ukey=f"{key}:{split}:{unit}"
+                    if ukey not in ckpt:
+                        ckpt[ukey]=list(dfs_connected_counts(nV, cyc_edges, cycmasks, tri_table, split, unit))
+                        if ckpt_path and time.time()-last_save >= ckpt_every:
+                            save_checkpoint(ckpt_path, ckpt); last_save=time.time()
+                    conn+=ckpt[ukey][0]; valid+=ckpt[ukey][1]
+                for unit in range(1<<split): del ckpt[f"{key}:{split}:{unit}"]
+            if ckpt is not None:
+                ckpt[key]=[conn, valid]
+                if ckpt_path and time.time()-last_save >= ckpt_every:
+                    save_checkpoint(ckpt_path, ckpt); last_save=time.time()
         tot_conn += conn
         tot_valid+= valid
+    if ckpt is not None and ckpt_path: save_checkpoint(ckpt_path, ckpt)
     G=len(edge_perms)
-    print(f"Completed {solid_name}!")
+    log(f"Completed {solid_name}!")
     return tot_all//G, tot_conn//G, tot_valid//G
 
 # ----- Geometry for solids -----
+# Each solid is built on first use by solid(name) and cached; nothing
+# below runs at import time.
 phi = (1 + 5**0.5)/2
 
-# Tetrahedron
-TetV = np.array([normalize(v) for v in [
-    ( 1, 1, 1), (-1,-1, 1), (-1, 1,-1), ( 1,-1,-1)
-]], dtype=float)
-TetE = sorted(tuple(sorted(e)) for e in itertools.combinations(range(4),2))
-TetF_tri = [(0,1,2),(0,1,3),(0,2,3),(1,2,3)]
-
-# Cube
-CubV = np.array([normalize(v) for v in itertools.product([-1,1], repeat=3)], dtype=float)
-CubE = []
-for i in range(8):
-    for j in range(i+1,8):
-        if np.sum(np.abs(CubV[i]-CubV[j])>1e-6)==1:
-            CubE.append((i,j))
-CubE=sorted(CubE)
-# Use triangular splits of square faces for frames (not for triangle filter)
-CubF_tri = []
-faces_quads=[
-  (7,5,1,3),(6,4,0,2),(7,5,4,6),(3,1,0,2),(5,1,0,4),(7,3,2,6)
-]
-for a,b,c,d in faces_quads:
-    CubF_tri += [(a,b,c),(a,c,d)]
-
-# Octahedron
-OctV = np.array([normalize(v) for v in [
-    (1,0,0),(-1,0,0),(0,1,0),(0,-1,0),(0,0,1),(0,0,-1)
-]], dtype=float)
-OctE=[]
-for i in range(6):
-    for j in range(i+1,6):
-        if np.isclose(np.dot(OctV[i], OctV[j]), 0.0, atol=1e-9):
-            OctE.append((i,j))
-OctE=sorted(OctE)
-OctF_tri=[
-    (0,2,4),(0,2,5),(0,3,4),(0,3,5),
-    (1,2,4),(1,2,5),(1,3,4),(1,3,5)
-]
-
-# Icosahedron
-IcoV = np.array([normalize(v) for v in [
-    (0, -1, -phi),
-    (0, -1,  phi),
-    (0,  1, -phi),
-    (0,  1,  phi),
-    (-1, -phi, 0),
-    (-1,  phi, 0),
-    ( 1, -phi, 0),
-    ( 1,  phi, 0),
-    (-phi, 0, -1),
-    ( phi, 0, -1),
-    (-phi, 0,  1),
-    ( phi, 0,  1),
-]], dtype=float)
-# Edges = minimal distance pairs
-def edges_from_vertices(vertices):
-    V=np.array(vertices)
-    n=len(V)
-    dists=[]
-    for i in range(n):
-        for j in range(i+1,n):
-            d=np.linalg.norm(V[i]-V[j])
-            dists.append((d,i,j))
-    dists.sort()
-    edges=set()
-    min_d=dists[0][0]
-    for d,i,j in dists:
-        if abs(d-min_d)<1e-6:
-            edges.add((i,j))
-        else:
-            break
-    return sorted(tuple(sorted(e)) for e in edges)
-
-IcoE = edges_from_vertices(IcoV)
-# Triangles = any triple of mutually adjacent vertices
-Eset=set(tuple(sorted(e)) for e in IcoE)
-IcoF_tri=sorted({tuple(sorted(f)) for f in itertools.combinations(range(12),3)
-                 if tuple(sorted((f[0],f[1]))) in Eset and
-                    tuple(sorted((f[1],f[2]))) in Eset and
-                    tuple(sorted((f[2],f[0]))) in Eset})
-
-# Dodecahedron (dual of icosahedron): vertices = face centers of Icosa
-DodV = []
-for a,b,c in IcoF_tri:
-    center = normalize((IcoV[a]+IcoV[b]+IcoV[c])/3.0)
-    DodV.append(center)
-# dedup
+SOLIDS = ("tetrahedron", "cube", "octahedron", "dodecahedron", "icosahedron")
+GROUP_ORDER = {"tetrahedron": 12, "cube": 24, "octahedron": 24,
+               "dodecahedron": 60, "icosahedron": 60}
+
+# tri: the triangular faces used by the "no full triangle" filter
+Solid = collections.namedtuple("Solid", "name V E tri")
+
+# Edges = minimal distance pairs, off one squared-distance matrix
+def edges_from_vertices(vertices, tol=1e-6):
+    V=np.asarray(vertices, dtype=float); sq=np.einsum('ij,ij->i', V, V)
+    d2=np.maximum(sq[:,None]+sq[None,:]-2.0*(V@V.T), 0.0)
+    np.fill_diagonal(d2, np.inf)
+    i,j=np.nonzero(d2 < (math.sqrt(d2.min())+tol)**2)   # row-major: sorted
+    return [(a,b) for a,b in zip(i.tolist(), j.tolist()) if a<b]
+
+# Triangles = per edge (i,j), the common neighbours k>j
+def triangles_from_edges(E):
+    nbr=collections.defaultdict(set)
+    for a,b in E: nbr[a].add(b); nbr[b].add(a)
+    return sorted((i,j,k) for i,j in (sorted(e) for e in E) for k in nbr[i]&nbr[j] if k>j)
+
 def unique_rows(a, tol=1e-8):
+    # first occurrences under np.allclose(atol=tol); rows hashed into grid
+    # cells twice that tolerance wide, so a duplicate can only be in the
+    # row's own cell or its nearer neighbour along each axis
+    a=np.asarray(a, dtype=float)
+    if len(a)==0: return np.array([])
+    sc=a/(2*(tol+1e-5*np.abs(a).max())); key=np.floor(sc)
+    side=np.where(sc-key<0.5, -1, 1).tolist(); key=key.astype(np.int64).tolist()
+    bumps=list(itertools.product((0,1), repeat=a.shape[1]))
+    cells={}; kept=[]
+    for i,(r,k,sd) in enumerate(zip(a.tolist(), key, side)):
+        near=(q for bp in bumps for q in cells.get(tuple(x+b*s for x,b,s in zip(k,bp,sd)), ()))
+        if not any(all(abs(x-y)<=tol+1e-5*abs(y) for x,y in zip(r,q)) for q in near):
+            kept.append(i); cells.setdefault(tuple(k), []).append(r)
+    return a[kept]
+
+def _tetrahedron():
+    TetV = np.array([normalize(v) for v in [
+        ( 1, 1, 1), (-1,-1, 1), (-1, 1,-1), ( 1,-1,-1)
+    ]], dtype=float)
+    TetE = sorted(tuple(sorted(e)) for e in itertools.combinations(range(4),2))
+    TetF_tri = [(0,1,2),(0,1,3),(0,2,3),(1,2,3)]
+    return TetV, TetE, TetF_tri
+
+def _cube(split_square_faces=False):
+    CubV = np.array([normalize(v) for v in itertools.product([-1,1], repeat=3)], dtype=float)
+    CubE = []
+    for i in range(8):
+        for j in range(i+1,8):
+            if np.sum(np.abs(CubV[i]-CubV[j])>1e-6)==1:
+                CubE.append((i,j))
+    CubE=sorted(CubE)
+    # Triangular splits of the square faces (CubF_tri) are frames; only with
+    # split_square_faces do they feed the triangle filter, where
+    # triangle_mask_table merges each pair of halves back into its square
+    CubF_tri = []
+    faces_quads=[
+      (7,5,1,3),(6,4,0,2),(7,5,4,6),(3,1,0,2),(5,1,0,4),(7,3,2,6)
+    ]
+    for a,b,c,d in faces_quads:
+        CubF_tri += [(a,b,c),(a,c,d)]
+    return CubV, CubE, (CubF_tri if split_square_faces else [])
+
+def _octahedron():
+    OctV = np.array([normalize(v) for v in [
+        (1,0,0),(-1,0,0),(0,1,0),(0,-1,0),(0,0,1),(0,0,-1)
+    ]], dtype=float)
+    OctE=[]
+    for i in range(6):
+        for j in range(i+1,6):
+            if np.isclose(np.dot(OctV[i], OctV[j]), 0.0, atol=1e-9):
+                OctE.append((i,j))
+    OctE=sorted(OctE)
+    OctF_tri=[
+        (0,2,4),(0,2,5),(0,3,4),(0,3,5),
+        (1,2,4),(1,2,5),(1,3,4),(1,3,5)
+    ]
+    return OctV, OctE, OctF_tri
+
+def _icosahedron():
+    IcoV = np.array([normalize(v) for v in [
+        (0, -1, -phi),
+        (0, -1,  phi),
+        (0,  1, -phi),
+        (0,  1,  phi),
+        (-1, -phi, 0),
+        (-1,  phi, 0),
+        ( 1, -phi, 0),
+        ( 1,  phi, 0),
+        (-phi, 0, -1),
+        ( phi, 0, -1),
+        (-phi, 0,  1),
+        ( phi, 0,  1),
+    ]], dtype=float)
+    IcoE = edges_from_vertices(IcoV)
+    IcoF_tri = triangles_from_edges(IcoE)
+    return IcoV, IcoE, IcoF_tri
+
+def _dodecahedron():
+    # dual of the icosahedron: vertices = face centers of Icosa
+    ico=solid("icosahedron")
+    DodV = []
+    for a,b,c in ico.tri:
+        center = normalize((ico.V[a]+ico.V[b]+ico.V[c])/3.0)
+        DodV.append(center)
+    DodV = unique_rows(np.array(DodV))
+    DodE = edges_from_vertices(DodV)
+    return DodV, DodE, []
+
+_BUILDERS = {"tetrahedron": _tetrahedron, "cube": _cube, "octahedron": _octahedron,
+             "icosahedron": _icosahedron, "dodecahedron": _dodecahedron}
+
+def _solid_name(s):
+    name = s.name if isinstance(s, Solid) else str(s).lower()
+    if name not in _BUILDERS:
+        raise ValueError(f"unknown solid {s!r}; expected one of {', '.join(SOLIDS)}")
+    return name
+
+@functools.lru_cache(maxsize=None)
+def _solid(name, split_square_faces):
+    V, E, tri = _cube(split_square_faces) if name=="cube" else _BUILDERS[name]()
+    return Solid(name, V, E, tri)
+
+def solid(name, split_square_faces=False):
+    # Solid(name, V, E, tri) for one of SOLIDS, built once and cached;
+    # split_square_faces also filters the cube's full squares
+    return _solid(_solid_name(name), bool(split_square_faces))
+
+def _as_solid(s):
+    return s if isinstance(s, Solid) else solid(s)
+
+# ----- Rotation groups from graph automorphisms -----
+def rotation_system(V, E):
+    # neighbours of every vertex in counterclockwise order seen from outside
+    # (outward = away from the centroid, which holds for convex polyhedra)
+    V=np.array(V, dtype=float); ctr=V.mean(axis=0)
+    nbr=[[] for _ in range(len(V))]
+    for a,b in E:
+        nbr[a].append(b); nbr[b].append(a)
     out=[]
-    for r in a:
-        if not any(np.allclose(r, q, atol=tol) for q in out):
-            out.append(r)
-    return np.array(out)
-DodV = unique_rows(np.array(DodV))
-DodE = edges_from_vertices(DodV)
-DodF_tri = []
+    for v,ns in enumerate(nbr):
+        if len(ns)<3: raise ValueError(f"vertex {v} has {len(ns)} neighbours; not a polyhedron")
+        n=normalize(V[v]-ctr); d=V[ns]-V[v]; d-=np.outer(d@n, n)
+        e1=normalize(d[0]); e2=np.cross(n, e1)
+        out.append([ns[i] for i in np.argsort(np.arctan2(d@e2, d@e1))])
+    return out
+
+def rotation_group_from_graph(V, E, verify=False):
+    # orientation-preserving automorphisms of the vertex-edge graph: anchor
+    # the flag (vertex 0, its first neighbour), send it to every directed
+    # edge in turn and propagate around each reached vertex in
+    # counterclockwise order; any clash means that image is no symmetry.
+    # Exact and float-free apart from the neighbour order. verify=True
+    # also checks that every permutation is realised by a proper rotation
+    # of the coordinates (not so for irregular realisations of a graph).
+    rot=rotation_system(V, E); n=len(rot)
+    pos=[{u:i for i,u in enumerate(ns)} for ns in rot]
+
+    def extend(a, b, a2, b2):
+        perm=[-1]*n; used=[False]*n
+        perm[a]=a2; used[a2]=True
+        todo=[(a,b,a2,b2)]
+        while todo:
+            a,b,a2,b2=todo.pop()
+            ra,rb=rot[a],rot[a2]; k=len(ra)
+            if len(rb)!=k: return None
+            i,j=pos[a][b],pos[a2][b2]
+            for t in range(k):
+                c,c2=ra[(i+t)%k],rb[(j+t)%k]
+                if perm[c]<0:
+                    if used[c2]: return None
+                    perm[c]=c2; used[c2]=True
+                    todo.append((c,a,c2,a2))
+                elif perm[c]!=c2: return None
+        return tuple(perm) if all(used) else None
+
+    a,b=0,rot[0][0]
+    flags=[(a,b)]+[(x,y) for x in range(n) for y in rot[x] if (x,y)!=(a,b)]
+    perms=[p for p in (extend(a,b,x,y) for x,y in flags) if p is not None]
+    if verify:
+        X=np.array(V, dtype=float); X=X-X.mean(axis=0); P=np.linalg.pinv(X)
+        for p in perms:
+            Y=X[list(p)]; R=(P@Y).T
+            if not (is_rot(R) and np.allclose(X@R.T, Y, atol=1e-6)):
+                raise ValueError(f"automorphism {p} is not a rotation of the vertices")
+    return perms
 
 # ----- Rotation groups via generators (each solid) -----
-def rotation_group_from_generators(V, gens_expected):
-    # close the group from generator rotation matrices; return vertex perms
-    V=np.array(V); n=len(V)
-    def vperm_from_R(R):
-        perm=[None]*n
-        for i in range(n):
-            j=nearest_index(R@V[i], V, tol=1e-5)
-            if j is None: return None
-            perm[i]=j
-        return tuple(perm)
-
-    # Close group
-    mats=[np.eye(3)]
-    perms=[tuple(range(n))]
-    def add(R):
-        # normalize by rounding for stability
-        # project to nearest proper rotation via SVD not needed for exact axes here
-        p=vperm_from_R(R)
-        if p is None: return False
-        if p in perms: return False
-        perms.append(p); mats.append(R)
-        return True
-
-    frontier=[np.eye(3)]
-    gens = gens_expected  # supplied list of generator matrices
-    while frontier:
-        new_frontier=[]
-        for A in frontier:
-            for G in gens:
-                for R in (G@A, A@G):
-                    if add(R):
-                        new_frontier.append(R)
-        frontier=new_frontier
+def close_perms(gens):
+    # group generated by permutations, identity first: BFS over an integer
+    # array, each level composed with every generator in one np.take
+    # (row a, generator b -> a[b[i]]), new elements spotted by their row
+    # bytes in a hash set. No float products, no list membership scans.
+    gens=np.array(gens, dtype=np.int32); n=gens.shape[1]; w=n*gens.itemsize
+    frontier=np.arange(n, dtype=np.int32)[None]
+    seen={frontier.tobytes()}; levels=[]
+    while len(frontier):
+        levels.append(frontier)
+        prod=np.take(frontier, gens, axis=1).reshape(-1, n); raw=prod.tobytes()
+        new=[]
+        for k in range(len(prod)):
+            key=raw[k*w:(k+1)*w]
+            if key not in seen: seen.add(key); new.append(k)
+        frontier=prod[new]
+    return [tuple(p) for p in np.concatenate(levels).tolist()]
 
-    return perms
+def rotation_group_from_generators(V, gens_expected):
+    # close the group from generator rotation matrices; return vertex perms.
+    # The matrices are only used once, to get the generators' vertex perms.
+    gens=vperms_from_rotations(V, gens_expected)
+    if any(p is None for p in gens): raise ValueError("generator does not map the vertices onto themselves")
+    return close_perms(gens)
 
 # Build generators for each solid
 def tetra_generators(V):
@@ -321,25 +571,12 @@ def dodeca_generators(V):
     
     return [R72, R120, R180]
 
-# Build vertex perms (rotation groups)
-Tet_perms = rotation_group_from_generators(TetV, tetra_generators(TetV))
-Cub_perms = rotation_group_from_generators(CubV, cube_generators(CubV))
-Oct_perms = rotation_group_from_generators(OctV, octa_generators(OctV))
-
 # For icosahedron and dodecahedron, use brute force approach
 def brute_force_rotations(V, max_rotations=120):
     """Find rotations by trying many axis-angle combinations"""
     n = len(V)
     perms = [tuple(range(n))]  # identity
     
-    def vperm_from_R(R):
-        perm = [None] * n
-        for i in range(n):
-            j = nearest_index(R @ V[i], V, tol=1e-5)
-            if j is None: return None
-            perm[i] = j
-        return tuple(perm)
-    
     # Try rotations around various axes
     axes_to_try = []
     # Vertex directions
@@ -348,7 +585,9 @@ def brute_force_rotations(V, max_rotations=120):
     # Edge midpoints
     for i in range(n):
         for j in range(i+1, n):
-            if np.linalg.norm(V[i] - V[j]) < 2.5:  # likely edge
+            # likely edge; antipodal pairs have no axis and would turn
+            # rot_axis_angle into the improper -I
+            if np.linalg.norm(V[i] - V[j]) < 2.5 and np.linalg.norm(V[i] + V[j]) > 1e-6:
                 axes_to_try.append(normalize((V[i] + V[j])/2))
     # Face centers (approximate)
     for i in range(n):
@@ -362,33 +601,41 @@ def brute_force_rotations(V, max_rotations=120):
     # Try common angles
     angles = [math.pi/6, math.pi/3, math.pi/2, 2*math.pi/3, math.pi, 4*math.pi/3, 3*math.pi/2, 5*math.pi/3, 2*math.pi/5, 4*math.pi/5]
     
-    for axis in axes_to_try:
-        for angle in angles:
-            if len(perms) >= max_rotations:
-                break
-            R = rot_axis_angle(axis, angle)
-            p = vperm_from_R(R)
-            if p is not None and p not in perms:
-                perms.append(p)
+    # Evaluate every axis-angle candidate in one batch
+    Rs = np.array([rot_axis_angle(axis, angle) for axis in axes_to_try for angle in angles])
+    for p in vperms_from_rotations(V, Rs):
         if len(perms) >= max_rotations:
             break
+        if p is not None and p not in perms:
+            perms.append(p)
     
     return perms
 
-Ico_perms = brute_force_rotations(IcoV, 60)
-Dod_perms = brute_force_rotations(DodV, 60)
-
-print(f"Tetrahedron perms: {len(Tet_perms)} (expected 12)")
-print(f"Cube perms: {len(Cub_perms)} (expected 24)")
-print(f"Octahedron perms: {len(Oct_perms)} (expected 24)")
-print(f"Icosahedron perms: {len(Ico_perms)} (expected 60)")
-print(f"Dodecahedron perms: {len(Dod_perms)} (expected 60)")
-
-assert len(Tet_perms)==12
-assert len(Cub_perms)==24
-assert len(Oct_perms)==24
-assert len(Ico_perms)==60
-assert len(Dod_perms)==60
+_GENERATORS = {"tetrahedron": tetra_generators, "cube": cube_generators,
+               "octahedron": octa_generators}
+
+GROUP_METHODS = ("graph", "numeric")
+
+@functools.lru_cache(maxsize=None)
+def _rotation_group(name, method):
+    s = solid(name)
+    if method == "graph":
+        perms = rotation_group_from_graph(s.V, s.E)
+    elif name in _GENERATORS:
+        perms = rotation_group_from_generators(s.V, _GENERATORS[name](s.V))
+    else:
+        perms = brute_force_rotations(s.V, GROUP_ORDER[name])
+    if len(perms) != GROUP_ORDER[name]:
+        raise RuntimeError(f"{name}: found {len(perms)} rotations, expected {GROUP_ORDER[name]}")
+    return tuple(perms)
+
+def rotation_group(s, method="graph"):
+    # vertex permutations of the rotation group of a solid (Solid or name),
+    # cached; "graph" = exact automorphism search, "numeric" = the old
+    # generator / axis-angle search
+    if method not in GROUP_METHODS:
+        raise ValueError(f"unknown group method {method!r}; expected one of {', '.join(GROUP_METHODS)}")
+    return list(_rotation_group(_solid_name(s), method))
 
 # Edge permutations
 def edge_perms_from_vperms(E, vperms):
@@ -398,42 +645,76 @@ def edge_perms_from_vperms(E, vperms):
         out.append([idx[tuple(sorted((p[a],p[b])))] for a,b in E])
     return out
 
-TetE_perms = edge_perms_from_vperms(TetE, Tet_perms)
-CubE_perms = edge_perms_from_vperms(CubE, Cub_perms)
-OctE_perms = edge_perms_from_vperms(OctE, Oct_perms)
-IcoE_perms = edge_perms_from_vperms(IcoE, Ico_perms)
-DodE_perms = edge_perms_from_vperms(DodE, Dod_perms)
-
-# Compute Burnside counts
-def counts_for(name, V,E,eperms,tri):
-    print(f"\n=== Starting {name} at {time.strftime('%H:%M:%S')} ===")
-    start_time = time.time()
-    allc, conn, valid = burnside_counts(V,E,eperms,tri, name)
-    elapsed = time.time() - start_time
-    print(f"=== Completed {name} in {elapsed:.1f} seconds ===")
-    return {
-        "V": len(V), "E": len(E), "G": len(eperms),
-        "Faces have triangles?": ("Yes" if len(tri)>0 else "No"),
-        "All Combinations": allc,
-        "All Connected": conn,
-        "Valid Incomplete": valid
-    }
-
-results = {
-    "Tetrahedron":  counts_for("Tetrahedron", TetV, TetE, TetE_perms, TetF_tri),
-    "Cube":         counts_for("Cube",        CubV, CubE, CubE_perms, []),
-    "Octahedron":   counts_for("Octahedron",  OctV, OctE, OctE_perms, OctF_tri),
-    "Dodecahedron": counts_for("Dodecahedron",DodV, DodE, DodE_perms, []),
-    "Icosahedron":  counts_for("Icosahedron", IcoV, IcoE, IcoE_perms, IcoF_tri),
-}
-
-try:
-    import pandas as pd
-    df = pd.DataFrame.from_dict(results, orient='index')[
-        ["V","E","G","Faces have triangles?","All Combinations","All Connected","Valid Incomplete"]
-    ].rename_axis("Platonic Solid").reset_index()
-    print(df.to_string(index=False))
-except Exception as e:
-    print("Results:")
-    for k,v in results.items():
-        print(k, v)
+def edge_perms(s, method="graph"):
+    s = _as_solid(s)
+    return edge_perms_from_vperms(s.E, rotation_group(s, method))
+
+# ----- Burnside counts -----
+def count(s, engine="dfs", ckpt=None, ckpt_path=None, ckpt_every=60.0, verbose=False,
+          group="graph"):
+    # (All Combinations, All Connected, Valid Incomplete) for a solid
+    # (Solid or name); see burnside_counts for the checkpoint arguments
+    if engine not in ENGINES:
+        raise ValueError(f"unknown engine {engine!r}; expected one of {', '.join(ENGINES)}")
+    s = _as_solid(s)
+    return burnside_counts(s.V, s.E, edge_perms(s, group), s.tri, s.name.capitalize(),
+                           ckpt, ckpt_path, ckpt_every, engine, verbose)
+
+def main(argv=None):
+    ap=argparse.ArgumentParser(description="Canonical edge-subset counts for the Platonic solids")
+    ap.add_argument("--solids", default=",".join(SOLIDS),
+                    help="comma-separated solids to count (default: all five)")
+    ap.add_argument("--engine", choices=sorted(ENGINES), default="dfs",
+                    help="fixed-subset counter per group element (default: dfs)")
+    ap.add_argument("--group", choices=GROUP_METHODS, default="graph",
+                    help="rotation group builder (default: graph automorphisms)")
+    ap.add_argument("--split-square-faces", action="store_true",
+                    help="also filter the cube's square faces (given as split triangles)")
+    ap.add_argument("--checkpoint", help="record finished group elements in this file; with "
+                    f"the dfs engine, elements of more than {UNIT_BITS} cycles are recorded in "
+                    "prefix units, so --resume continues inside them")
+    ap.add_argument("--checkpoint-interval", type=float, default=60.0,
+                    help="seconds between checkpoint writes (default: 60)")
+    ap.add_argument("--resume", action="store_true", help="reuse elements recorded in the checkpoint")
+    args=ap.parse_args(argv)
+    if args.resume and not args.checkpoint: ap.error("--resume requires --checkpoint")
+    names=[n.strip().lower() for n in args.solids.split(",") if n.strip()]
+    for n in names:
+        if n not in GROUP_ORDER: ap.error(f"unknown solid: {n}")
+    ckpt=None
+    if args.checkpoint:
+        ckpt=load_checkpoint(args.checkpoint) if args.resume else {}
+
+    for n in names:
+        print(f"{n.capitalize()} perms: {len(rotation_group(n, args.group))} (expected {GROUP_ORDER[n]})")
+
+    results={}
+    for n in names:
+        s=solid(n, args.split_square_faces); name=n.capitalize()
+        print(f"\n=== Starting {name} at {time.strftime('%H:%M:%S')} ===")
+        start_time = time.time()
+        allc, conn, valid = count(s, args.engine, ckpt, args.checkpoint,
+                                  args.checkpoint_interval, verbose=True, group=args.group)
+        elapsed = time.time() - start_time
+        print(f"=== Completed {name} in {elapsed:.1f} seconds ===")
+        results[name] = {
+            "V": len(s.V), "E": len(s.E), "G": GROUP_ORDER[n],
+            "Faces have triangles?": ("Yes" if len(s.tri)>0 else "No"),
+            "All Combinations": allc,
+            "All Connected": conn,
+            "Valid Incomplete": valid
+        }
+
+    try:
+        import pandas as pd
+        df = pd.DataFrame.from_dict(results, orient='index')[
+            ["V","E","G","Faces have triangles?","All Combinations","All Connected","Valid Incomplete"]
+        ].rename_axis("Platonic Solid").reset_index()
+        print(df.to_string(index=False))
+    except Exception as e:
+        print("Results:")
+        for k,v in results.items():
+            print(k, v)
+
+if __name__ == "__main__":
+    main()
@@ -1,153 +1,213 @@
 #!/usr/bin/env python3
 """
-Performance Test and Comparison Script
-=====================================
+Platonic Solids Benchmark Suite
+===============================
 
-Tests the optimized Platonic solids counter against the original implementation
-to demonstrate performance improvements.
+Times the optimized counter phase by phase, per solid and per engine:
+
+- geometry: vertices, edges and triangles of the solid
+- group: rotation group generation and edge permutations
+- cycles: conjugacy classes and cycle decompositions (SolidState)
+- enumeration: Burnside counting with the chosen engine
+
+Each phase runs --repeat times; the JSON report keeps every run plus the
+minimum and median, the enumeration throughput in fixed subsets per second
+and the peak RSS. With --baseline a stored report is compared against and
+enumeration slowdowns beyond --tolerance are flagged (exit status 1).
+
+Usage: python performance_test.py [--solids tetrahedron,cube] [--engines frontier,vertex]
+                                  [--repeat 3] [--json report.json]
+                                  [--baseline old.json [--tolerance 0.2]]
 """
 
-import time
-import subprocess
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import statistics
 import sys
-from multiprocessing import cpu_count
+import time
 
-def run_original_tetrahedron():
-    """Test original implementation on tetrahedron only."""
-    print("Testing original implementation (tetrahedron only)...")
-    
-    # Import and run original algorithm for tetrahedron
-    try:
-        # This would run the original platonic_counts.py but only for tetrahedron
-        # We'll simulate this with a simple timing test
-        start_time = time.time()
-        
-        # Simulate original algorithm complexity
-        # Original: ~96 operations for tetrahedron
-        operations = 0
-        for perm in range(12):  # 12 permutations
-            for subset in range(8):  # ~2^3 subsets per permutation
-                # Simulate connectivity check + triangle check
-                operations += 1
-                if operations % 10 == 0:
-                    time.sleep(0.001)  # Simulate computation time
-        
-        elapsed = time.time() - start_time
-        print(f"Original (simulated) tetrahedron: {elapsed:.3f} seconds")
-        return elapsed
-        
-    except Exception as e:
-        print(f"Could not run original: {e}")
-        return None
-
-def run_optimized_version(solids="tetrahedron", workers=None):
-    """Run the optimized version."""
-    if workers is None:
-        workers = cpu_count()
-    
-    print(f"Testing optimized implementation ({solids}) with {workers} workers...")
-    
-    try:
-        cmd = [
-            sys.executable, 
-            "platonic_counts_optimized.py", 
-            "--workers", str(workers),
-            "--solids", solids
-        ]
-        
-        start_time = time.time()
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)  # 5 min timeout
-        elapsed = time.time() - start_time
-        
-        if result.returncode == 0:
-            print(f"Optimized ({solids}): {elapsed:.3f} seconds")
-            print("Output:")
-            print(result.stdout[-500:])  # Last 500 chars
-            return elapsed
-        else:
-            print(f"Error running optimized version: {result.stderr}")
-            return None
-            
-    except subprocess.TimeoutExpired:
-        print("Optimized version timed out (>5 minutes)")
-        return None
-    except Exception as e:
-        print(f"Could not run optimized version: {e}")
-        return None
-
-def estimate_performance_gains():
-    """Estimate theoretical performance gains."""
-    print("\n" + "="*60)
-    print("THEORETICAL PERFORMANCE ANALYSIS")
-    print("="*60)
-    
-    # Complexity analysis
-    solids_data = {
-        "Tetrahedron": {"vertices": 4, "edges": 6, "group": 12, "avg_cycles": 3},
-        "Cube": {"vertices": 8, "edges": 12, "group": 24, "avg_cycles": 4}, 
-        "Octahedron": {"vertices": 6, "edges": 12, "group": 24, "avg_cycles": 4},
-        "Icosahedron": {"vertices": 12, "edges": 30, "group": 60, "avg_cycles": 10},
-        "Dodecahedron": {"vertices": 20, "edges": 30, "group": 60, "avg_cycles": 10}
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import platonic_counts_optimized as pco
+
+DEFAULT_SOLIDS = 'tetrahedron,cube,octahedron,icosahedron,dodecahedron'
+
+def peak_rss_mb():
+    """Peak resident set size of this process and its finished children, in MB."""
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    scale = 1 << 20 if sys.platform == 'darwin' else 1 << 10
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    return peak / scale
+
+def time_phase(fn, repeat, setup=None):
+    """Run fn() ``repeat`` times with its output suppressed, calling the
+    untimed ``setup()`` before each run.
+
+    Returns (last result, timing summary).
+    """
+    runs = []
+    result = None
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            result = fn()
+            runs.append(time.perf_counter() - start)
+    return result, {'runs': runs, 'min': min(runs), 'median': statistics.median(runs)}
+
+def reset_engine_caches():
+    """Drop per-process engine tables so every run pays for building them."""
+    pco._VERTEX_COUNTERS.clear()
+
+def fixed_subsets(state):
+    """Number of fixed subsets the Burnside sum covers: sum of 2^c over the group."""
+    return sum(weight << len(cycsets) for cycsets, weight in state.items)
+
+def benchmark_solid(name, engines, repeat, workers, backend):
+    """Phase timings and counts for one solid."""
+    (vertices, edges, triangles), geometry_timing = time_phase(
+        lambda: pco.platonic_solid_data(name), repeat)
+
+    def build_group():
+        return pco.edge_perms_from_vperms(edges, pco.build_rotation_group(vertices, edges))
+
+    edge_perms, group_timing = time_phase(build_group, repeat)
+    state, cycles_timing = time_phase(
+        lambda: pco.SolidState(vertices, edges, edge_perms, triangles), repeat)
+    pco.install_solid_states({name: state})
+    subsets = fixed_subsets(state)
+
+    report = {
+        'V': len(vertices), 'E': len(edges), 'G': len(edge_perms),
+        'fixed_subsets': subsets,
+        'phases': {'geometry': geometry_timing, 'group': group_timing, 'cycles': cycles_timing},
+        'engines': {},
     }
-    
-    print(f"{'Solid':<12} {'Original':<15} {'Optimized':<15} {'Speedup':<10}")
-    print("-" * 60)
-    
-    for solid, data in solids_data.items():
-        # Original complexity: Group_size × 2^avg_cycles × overhead
-        original_ops = data["group"] * (2 ** data["avg_cycles"]) * 10  # overhead factor
-        
-        # Optimized complexity: Group_size × 2^avg_cycles / parallelization / vectorization
-        workers = cpu_count()
-        vectorization_factor = 5  # Batch processing + NumPy
-        optimized_ops = original_ops / workers / vectorization_factor
-        
-        speedup = original_ops / optimized_ops
-        
-        print(f"{solid:<12} {original_ops:<15,} {optimized_ops:<15,.0f} {speedup:<10.1f}x")
-    
-    print(f"\nUsing {cpu_count()} CPU cores for parallelization")
-    print("Vectorization factor: ~5x from batch processing + NumPy")
+    executor = pco.make_executor(backend, workers, {name: state})
+    try:
+        for engine in engines:
+            runs = []
+
+            def count():
+                instrumentation = pco.Instrumentation([pco.QuietSink()])
+                runs.append(instrumentation)
+                return pco.burnside_counts_optimized(
+                    vertices, edges, edge_perms, triangles, name, workers, engine=engine,
+                    executor=executor, solid_id=name, instrumentation=instrumentation)
+
+            counts, timing = time_phase(count, repeat, setup=reset_engine_caches)
+            timing['subsets_per_second'] = subsets / timing['min'] if timing['min'] > 0 else None
+            timing['counts'] = list(counts)
+            # Counters and per-worker throughput of the last run
+            timing['metrics'] = runs[-1].summary()
+            report['engines'][engine] = timing
+            print(f"  {name:<13} {engine:<10} {timing['min']:>9.3f}s  "
+                  f"{timing['subsets_per_second'] or 0:>14,.0f} subsets/s  counts {tuple(counts)}")
+    finally:
+        executor.close()
+        executor.join()
+
+    distinct = {tuple(t['counts']) for t in report['engines'].values()}
+    if len(distinct) > 1:
+        print(f"  WARNING: engines disagree on {name}: {sorted(distinct)}")
+        report['engines_agree'] = False
+    else:
+        report['engines_agree'] = True
+    return report
+
+def compare_with_baseline(report, baseline, tolerance):
+    """Enumeration timings slower than the baseline by more than ``tolerance``.
+
+    Returns a list of (solid, engine, baseline seconds, current seconds).
+    """
+    regressions = []
+    for name, solid in report['solids'].items():
+        old_solid = baseline.get('solids', {}).get(name)
+        if old_solid is None:
+            continue
+        for engine, timing in solid['engines'].items():
+            old = old_solid['engines'].get(engine)
+            if old is None:
+                continue
+            if timing['min'] > old['min'] * (1 + tolerance):
+                regressions.append((name, engine, old['min'], timing['min']))
+            if old.get('counts') is not None and old['counts'] != timing['counts']:
+                print(f"  WARNING: {name}/{engine} counts changed: {old['counts']} -> {timing['counts']}")
+    return regressions
 
 def main():
-    """Main performance testing function."""
-    print("Platonic Solids Performance Test")
+    """Run the benchmarks and write / compare reports."""
+    parser = argparse.ArgumentParser(description='Benchmark the Platonic solids counter')
+    parser.add_argument('--solids', type=str, default=DEFAULT_SOLIDS,
+                       help='Comma-separated list of solids to benchmark')
+    parser.add_argument('--engines', type=str, default='frontier,vertex',
+                       help='Comma-separated list of engines (enumerate takes hours '
+                            'on the 30-edge solids)')
+    parser.add_argument('--repeat', type=int, default=3,
+                       help='Runs per phase (default: 3)')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Workers for the enumeration phase (default: 1)')
+    parser.add_argument('--backend', choices=pco.BACKENDS, default=None,
+                       help='Executor backend for more than one worker')
+    parser.add_argument('--json', type=str, default=None,
+                       help='Write the report to this JSON file')
+    parser.add_argument('--baseline', type=str, default=None,
+                       help='Compare against a report written with --json')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                       help='Allowed relative slowdown before a regression is flagged')
+
+    args = parser.parse_args()
+    engines = [e.strip() for e in args.engines.split(',')]
+    for engine in engines:
+        if engine not in pco.ENGINES:
+            parser.error(f"unknown engine: {engine}")
+    backend = 'serial' if args.workers <= 1 else (args.backend or pco.default_backend())
+
+    print("Platonic Solids Benchmark")
     print("=" * 40)
-    
-    # Test simple cases first
-    print("\n1. Testing simple solids (tetrahedron, cube, octahedron)...")
-    simple_time = run_optimized_version("tetrahedron,cube,octahedron")
-    
-    if simple_time and simple_time < 60:  # If simple cases run in under 1 minute
-        print("\n2. Testing complex solids (icosahedron only - limited)...")
-        # Test icosahedron with fewer workers to avoid memory issues
-        complex_time = run_optimized_version("icosahedron", workers=2)
-        
-        if complex_time:
-            print(f"\nPerformance comparison:")
-            print(f"  Simple solids (3): {simple_time:.1f} seconds")
-            print(f"  Icosahedron (1): {complex_time:.1f} seconds")
-            print(f"  Estimated dodecahedron: {complex_time * 1.2:.1f} seconds")
-    else:
-        print("Simple cases took too long, skipping complex solids")
-    
-    # Show theoretical analysis
-    estimate_performance_gains()
-    
-    print("\n" + "="*60)
-    print("OPTIMIZATION SUMMARY")
-    print("="*60)
-    print("Key optimizations implemented:")
-    print("1. ✅ Multiprocessing parallelization (CPU cores)")
-    print("2. ✅ NumPy vectorization (batch operations)")
-    print("3. ✅ Precomputed connectivity matrices")
-    print("4. ✅ Early termination (large cycle counts)")
-    print("5. ✅ Memory-efficient batch processing")
-    print("6. ✅ Optimized rotation group generation")
-    
-    print(f"\nExpected speedup: {cpu_count() * 5:.0f}x on {cpu_count()}-core system")
-    print("Original icosahedron time: 6-24 hours")
-    print("Optimized icosahedron time: 10-60 minutes")
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'workers': args.workers,
+        'backend': backend,
+        'repeat': args.repeat,
+        'solids': {},
+    }
+
+    for name in [s.strip() for s in args.solids.split(',')]:
+        if name not in pco.PLATONIC_SOLIDS:
+            print(f"Unknown solid: {name}")
+            continue
+        report['solids'][name] = benchmark_solid(
+            name, engines, args.repeat, args.workers, backend)
+
+    report['peak_rss_mb'] = peak_rss_mb()
+    print(f"  peak RSS {report['peak_rss_mb']:.1f} MB")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.json}")
+
+    status = 0 if all(s['engines_agree'] for s in report['solids'].values()) else 1
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(report, baseline, args.tolerance)
+        for name, engine, old, new in regressions:
+            print(f"  REGRESSION {name}/{engine}: {old:.3f}s -> {new:.3f}s")
+        if regressions:
+            status = 1
+        else:
+            print(f"No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+    return status
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -7,19 +7,38 @@ High-performance implementation using:
 - Multiprocessing parallelization
 - NumPy vectorization
 - Precomputed connectivity matrices
-- Early termination strategies
+- Frontier (transfer-matrix) counting of connected subsets
 - Memory-efficient algorithms
 
 Usage: python platonic_counts_optimized.py [--workers N] [--solids tetra,cube,octa,ico,dod]
+                                          [--polyhedron FILE|SHAPE ...]
+                                          [--engine frontier|vertex|enumerate]
+                                          [--backend serial|process|thread|futures]
+                                          [--group graph|search [--verify-group]]
+                                          [--packs DIR | --no-packs] [--build-packs]
+                                          [--checkpoint FILE [--resume]] [--cache FILE]
+                                          [--predicate-cache-mb MB]
+                                          [--progress bar|quiet] [--metrics-jsonl FILE]
 """
 
+import hashlib
 import itertools
+import json
 import math
+import os
+import shutil
+import sqlite3
+import sys
+import threading
+from collections import Counter, OrderedDict, defaultdict
 import numpy as np
 import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from multiprocessing import Pool, cpu_count
+from multiprocessing.pool import ThreadPool
 from functools import partial
 import argparse
+import contextlib
 from typing import List, Tuple, Set, Dict, Any
 
 def normalize(v):
@@ -41,11 +60,61 @@ def rot_axis_angle(axis, theta):
         [z*x*C - y*s, z*y*C + x*s, c + z*z*C]
     ], dtype=float)
 
-def nearest_index(p, V, tol=1e-5):
-    """Find nearest vertex index to point p."""
-    distances = np.linalg.norm(V - p, axis=1)
-    min_idx = np.argmin(distances)
-    return min_idx if distances[min_idx] < tol else None
+def rot_axis_angle_batch(axes, thetas):
+    """Stack of rotation matrices, shape (k, 3, 3), one per axis-angle pair."""
+    axes = np.asarray(axes, dtype=float).reshape(-1, 3)
+    norms = np.linalg.norm(axes, axis=1, keepdims=True)
+    axes = np.divide(axes, norms, out=np.zeros_like(axes), where=norms > 0)
+    thetas = np.asarray(thetas, dtype=float).reshape(-1)
+    c = np.cos(thetas)[:, None, None]
+    s = np.sin(thetas)[:, None, None]
+    x, y, z = axes.T
+    zero = np.zeros_like(x)
+    cross = np.stack([np.stack([zero, -z, y], axis=-1),
+                      np.stack([z, zero, -x], axis=-1),
+                      np.stack([-y, x, zero], axis=-1)], axis=1)
+    return c * np.eye(3) + s * cross + (1 - c) * np.einsum('ki,kj->kij', axes, axes)
+
+VERTEX_HASH_DECIMALS = 5
+
+def vertex_hash_table(vertices, decimals=VERTEX_HASH_DECIMALS):
+    """Map rounded coordinates to vertex indices.
+
+    Every vertex is entered under each floor/ceil combination of its scaled
+    coordinates, so a point within rounding distance of it is found whichever
+    way its own coordinates round.
+    """
+    scale = 10.0 ** decimals
+    scaled = np.asarray(vertices, dtype=float) * scale
+    low = np.floor(scaled).astype(np.int64).tolist()
+    table = {}
+    for i, key in enumerate(low):
+        for bump in itertools.product((0, 1), repeat=len(key)):
+            table[tuple(k + b for k, b in zip(key, bump))] = i
+    return table
+
+def vertex_perms_from_rotations(vertices, rotations, decimals=VERTEX_HASH_DECIMALS, table=None):
+    """Vertex permutations induced by a stack of rotation matrices.
+
+    All images come from one einsum over the (k, 3, 3) stack and are matched
+    through vertex_hash_table instead of a distance scan per vertex. Returns
+    one tuple per rotation, or None where some image is not a vertex.
+    """
+    V = np.asarray(vertices, dtype=float)
+    if table is None:
+        table = vertex_hash_table(V, decimals)
+    rotations = np.asarray(rotations, dtype=float).reshape(-1, 3, 3)
+    images = np.einsum('kij,nj->kni', rotations, V)
+    keys = np.rint(images * 10.0 ** decimals).astype(np.int64)
+    # Most candidates are not symmetries; rejecting on vertex 0 first keeps
+    # them from paying for a lookup of every vertex
+    perms = [None] * len(keys)
+    for k, first in enumerate(keys[:, 0].tolist()):
+        if tuple(first) in table:
+            perm = tuple(map(table.get, map(tuple, keys[k].tolist())))
+            if None not in perm:
+                perms[k] = perm
+    return perms
 
 def cycles_of_perm(perm):
     """Find cycle decomposition of permutation."""
@@ -60,372 +129,1959 @@ def cycles_of_perm(perm):
                 seen[j] = True
                 cycle.append(j)
                 j = perm[j]
-            if len(cycle) > 1:  # Only non-trivial cycles
-                cycles.append(cycle)
+            # Fixed edges are 1-cycles: each one can be in or out of a fixed subset
+            cycles.append(cycle)
     return cycles
 
 class ConnectivityChecker:
-    """Optimized connectivity checking using precomputed adjacency matrices."""
+    """Connectivity checking on edge-subset bitmasks (bit i = edge i)."""
     
     def __init__(self, vertices, edges):
         self.nV = len(vertices)
         self.edges = edges
         self.nE = len(edges)
         
-        # Precompute adjacency matrix
-        self.adj_matrix = np.zeros((self.nV, self.nV), dtype=bool)
+        # Precompute per-edge endpoints and endpoint bitmasks
         self.edge_to_vertices = {}
+        self.edge_vertex_masks = []
         
         for i, (a, b) in enumerate(edges):
-            self.adj_matrix[a, b] = True
-            self.adj_matrix[b, a] = True
             self.edge_to_vertices[i] = (a, b)
+            self.edge_vertex_masks.append((1 << a) | (1 << b))
+    
+    def used_vertex_mask(self, edge_mask):
+        """Bitmask of vertices touched by the edges in edge_mask."""
+        used = 0
+        while edge_mask:
+            low = edge_mask & -edge_mask
+            used |= self.edge_vertex_masks[low.bit_length() - 1]
+            edge_mask ^= low
+        return used
     
-    def get_used_vertices(self, edge_indices):
-        """Get vertices used by given edges."""
-        if not edge_indices:
-            return np.array([], dtype=int)
+    def is_connected(self, edge_mask):
+        """Bit-parallel BFS: True if the edges connect every vertex they use.
         
-        vertices = set()
-        for ei in edge_indices:
-            a, b = self.edge_to_vertices[ei]
-            vertices.add(a)
-            vertices.add(b)
-        return np.array(sorted(vertices))
-    
-    def is_connected_vectorized(self, edge_indices_list):
-        """Vectorized connectivity check for multiple edge sets."""
-        results = []
-        for edge_indices in edge_indices_list:
-            if not edge_indices:
-                results.append(True)  # Empty set is connected
-                continue
-                
-            used_vertices = self.get_used_vertices(edge_indices)
-            if len(used_vertices) <= 1:
-                results.append(True)
-                continue
-            
-            # Build subgraph adjacency matrix
-            sub_adj = np.zeros((len(used_vertices), len(used_vertices)), dtype=bool)
-            vertex_map = {v: i for i, v in enumerate(used_vertices)}
-            
-            for ei in edge_indices:
-                a, b = self.edge_to_vertices[ei]
-                if a in vertex_map and b in vertex_map:
-                    ia, ib = vertex_map[a], vertex_map[b]
-                    sub_adj[ia, ib] = True
-                    sub_adj[ib, ia] = True
-            
-            # BFS connectivity check
-            visited = np.zeros(len(used_vertices), dtype=bool)
-            queue = [0]
-            visited[0] = True
-            
-            while queue:
-                current = queue.pop(0)
-                neighbors = np.where(sub_adj[current])[0]
-                for neighbor in neighbors:
-                    if not visited[neighbor]:
-                        visited[neighbor] = True
-                        queue.append(neighbor)
-            
-            results.append(np.all(visited))
+        Each used vertex gets a neighbor bitmask for this subset; the reached
+        set grows by OR-ing the neighbors of the last frontier until nothing
+        new is added.
+        """
+        if not edge_mask:
+            return True  # Empty set is connected
+        nbrs = [0] * self.nV
+        used = 0
+        while edge_mask:
+            low = edge_mask & -edge_mask
+            a, b = self.edge_to_vertices[low.bit_length() - 1]
+            nbrs[a] |= 1 << b
+            nbrs[b] |= 1 << a
+            used |= self.edge_vertex_masks[low.bit_length() - 1]
+            edge_mask ^= low
+        
+        reach = frontier = used & -used
+        while frontier:
+            grown = 0
+            while frontier:
+                low = frontier & -frontier
+                grown |= nbrs[low.bit_length() - 1]
+                frontier ^= low
+            frontier = grown & ~reach
+            reach |= frontier
+        return reach == used
+    
+    def is_connected_vectorized(self, edge_masks):
+        """Connectivity check for multiple edge-subset bitmasks."""
+        return [self.is_connected(m) for m in edge_masks]
+    
+    def is_connected_batch(self, edge_masks):
+        """Array-wide connectivity for a uint64 array of edge bitmasks.
         
-        return results
+        Neighbor and used-vertex masks for the whole batch come from one
+        masked OR per edge. Each mask is seeded with its lowest used vertex
+        and swept over the vertices in place until no mask changes. A path
+        inside a subset can be longer than the graph diameter, so the sweeps
+        run to a fixpoint (at most nV - 1 of them). Returns a boolean array;
+        the empty subset counts as connected.
+        """
+        edge_masks = np.asarray(edge_masks, dtype=np.uint64)
+        one = np.uint64(1)
+        nbrs = [np.zeros_like(edge_masks) for _ in range(self.nV)]
+        used = np.zeros_like(edge_masks)
+        for i, (a, b) in self.edge_to_vertices.items():
+            # all-ones where edge i is present, zero elsewhere
+            present = -((edge_masks >> np.uint64(i)) & one)
+            nbrs[a] |= present & np.uint64(1 << b)
+            nbrs[b] |= present & np.uint64(1 << a)
+            used |= present & np.uint64(self.edge_vertex_masks[i])
+        
+        reach = used & -used
+        shifts = [np.uint64(v) for v in range(self.nV)]
+        for _ in range(max(1, self.nV - 1)):
+            prev = reach.copy()
+            for v in range(self.nV):
+                reach |= nbrs[v] & -((reach >> shifts[v]) & one)
+            if np.array_equal(reach, prev):
+                break
+        return reach == used
 
 class TriangleChecker:
-    """Optimized triangle detection using precomputed triangle sets."""
+    """Triangle (face) detection on edge-subset bitmasks."""
     
     def __init__(self, edges, triangular_faces):
         self.edges = edges
         self.triangular_faces = triangular_faces
         
-        # Precompute edge sets for each triangle
-        edge_to_idx = {tuple(sorted(e)): i for i, e in enumerate(edges)}
-        self.triangle_edge_sets = []
-        
-        for a, b, c in triangular_faces:
-            triangle_edges = []
-            for edge_pair in [(a, b), (b, c), (c, a)]:
-                edge_key = tuple(sorted(edge_pair))
-                if edge_key in edge_to_idx:
-                    triangle_edges.append(edge_to_idx[edge_key])
-            if len(triangle_edges) == 3:
-                self.triangle_edge_sets.append(set(triangle_edges))
-    
-    def contains_triangle_vectorized(self, edge_indices_list):
-        """Vectorized triangle detection for multiple edge sets."""
-        results = []
-        for edge_indices in edge_indices_list:
-            edge_set = set(edge_indices)
-            has_triangle = any(triangle_edges.issubset(edge_set) 
-                             for triangle_edges in self.triangle_edge_sets)
-            results.append(has_triangle)
-        return results
-
-def process_permutation_chunk(args):
-    """Process a chunk of permutations for parallel computation."""
-    cycsets_chunk, vertices, edges, triangular_faces, chunk_id = args
-    
-    # Recreate checkers in worker process (avoid pickling issues)
-    connectivity_checker = ConnectivityChecker(vertices, edges)
-    triangle_checker = TriangleChecker(edges, triangular_faces)
-    
-    chunk_all = 0
-    chunk_conn = 0
-    chunk_valid = 0
-    
-    print(f"  Chunk {chunk_id}: Processing {len(cycsets_chunk)} permutations...")
-    
-    for perm_idx, cycsets in enumerate(cycsets_chunk):
-        if perm_idx % 10 == 0 and perm_idx > 0:
-            print(f"    Chunk {chunk_id}: {perm_idx}/{len(cycsets_chunk)} permutations")
-        
-        c = len(cycsets)
-        chunk_all += 2**c
-        
-        # Early termination for very large cycle counts
-        if c > 20:  # 2^20 = ~1M subsets, still manageable
-            print(f"    Chunk {chunk_id}: Skipping permutation with {c} cycles (too large)")
-            continue
-        
-        # Generate all subset combinations efficiently
-        total_subsets = 1 << c
-        
-        # Batch process subsets for vectorization
-        batch_size = min(1000, total_subsets)
-        
-        for batch_start in range(0, total_subsets, batch_size):
-            batch_end = min(batch_start + batch_size, total_subsets)
-            
-            # Generate batch of edge index lists
-            edge_indices_batch = []
-            for mask in range(batch_start, batch_end):
-                subset_edges = set()
-                for i in range(c):
-                    if (mask >> i) & 1:
-                        subset_edges.update(cycsets[i])
-                edge_indices_batch.append(sorted(subset_edges))
-            
-            # Vectorized connectivity check
-            connectivity_results = connectivity_checker.is_connected_vectorized(edge_indices_batch)
-            
-            # Count connected subsets
-            connected_indices = [i for i, connected in enumerate(connectivity_results) if connected]
-            chunk_conn += len(connected_indices)
-            
-            if triangle_checker.triangle_edge_sets:  # Only if triangles exist
-                # Vectorized triangle check for connected subsets only
-                connected_edge_lists = [edge_indices_batch[i] for i in connected_indices]
-                triangle_results = triangle_checker.contains_triangle_vectorized(connected_edge_lists)
-                
-                # Count valid (connected, no triangles) subsets
-                valid_count = sum(1 for has_triangle in triangle_results if not has_triangle)
-                chunk_valid += valid_count
+        # Precompute one edge bitmask per face, plus a uint64 table for batches
+        self.triangle_masks = [sum(1 << e for e in tri)
+                               for tri in triangle_edge_indices(edges, triangular_faces)]
+        if len(edges) <= 64:
+            self.triangle_mask_array = np.array(self.triangle_masks, dtype=np.uint64)
+        else:
+            self.triangle_mask_array = None
+    
+    def contains_triangle_vectorized(self, edge_masks):
+        """Vectorized triangle detection for multiple edge-subset bitmasks."""
+        tri_masks = self.triangle_masks
+        return [any(m & t == t for t in tri_masks) for m in edge_masks]
+    
+    def contains_triangle_batch(self, edge_masks):
+        """Triangle detection for a uint64 array of edge masks in one
+        broadcasted ``(masks[:, None] & tri) == tri`` reduction."""
+        tri = self.triangle_mask_array
+        if not len(tri):
+            return np.zeros(len(edge_masks), dtype=bool)
+        return ((edge_masks[:, None] & tri) == tri).any(axis=1)
+
+# Masks per NumPy call when enumerating cycle unions
+NUMPY_BATCH_SIZE = 1 << 16
+# Masks per call for edge sets too wide for uint64 (Python int masks)
+SCALAR_BATCH_SIZE = 1 << 10
+# The enumerate engine splits elements into work units of 2^WORK_UNIT_BITS masks
+WORK_UNIT_BITS = 18
+
+def cycle_union_table(cycle_masks):
+    """All 2^k unions of the given cycle edge masks, indexed by subset mask."""
+    table = np.zeros(1, dtype=np.uint64)
+    for m in cycle_masks:
+        table = np.concatenate([table, table | np.uint64(m)])
+    return table
+
+def batch_shortcuts(common_mask, varying_mask, connectivity_checker, triangle_checker):
+    """Monotone shortcuts for the masks ``common_mask | part`` (part of varying_mask).
+
+    Returns (all_connected, has_triangle). Containing a triangle is
+    upward-closed, so a triangle inside the common part is in every mask of
+    the batch. A connected common part whose vertices touch every varying
+    edge stays connected whatever is added to it.
+    """
+    has_triangle = any(common_mask & t == t for t in triangle_checker.triangle_masks)
+    if not common_mask or not connectivity_checker.is_connected(common_mask):
+        return False, has_triangle
+    used = connectivity_checker.used_vertex_mask(common_mask)
+    while varying_mask:
+        low = varying_mask & -varying_mask
+        if not connectivity_checker.edge_vertex_masks[low.bit_length() - 1] & used:
+            return False, has_triangle
+        varying_mask ^= low
+    return True, has_triangle
+
+def connected_and_valid_block(edge_masks, connectivity_checker, triangle_checker,
+                              all_connected=False, has_triangle=False):
+    """Count connected and connected triangle-free edge masks in a NumPy block.
+
+    ``all_connected`` and ``has_triangle`` are batch_shortcuts results; they
+    skip the connectivity check and the triangle filter respectively.
+    """
+    if all_connected:
+        connected_masks = edge_masks
+    else:
+        connected_masks = edge_masks[connectivity_checker.is_connected_batch(edge_masks)]
+    n_conn = len(connected_masks)
+    if has_triangle:
+        return n_conn, 0
+    n_valid = n_conn - int(np.count_nonzero(triangle_checker.contains_triangle_batch(connected_masks)))
+    return n_conn, n_valid
+
+# Rough footprint of one PredicateCache entry (int key, small int value, LRU links)
+PREDICATE_CACHE_ENTRY_BYTES = 200
+
+class PredicateCache:
+    """Bounded LRU cache from edge mask to predicate flags.
+
+    Flags are CONNECTED | TRIANGLE bits. Every fixed subset of an element
+    is also fixed by the identity, and elements share fixed subsets, so
+    the enumerate engine can look masks up here before testing them. One
+    cache lives in each process per solid (threads of the thread backend
+    share it); pickling it for a worker yields an empty cache with the
+    same budget.
+    """
+    CONNECTED = 1
+    TRIANGLE = 2
+    
+    def __init__(self, budget_mb):
+        self.budget_mb = budget_mb
+        self.capacity = max(1, int(budget_mb * (1 << 20)) // PREDICATE_CACHE_ENTRY_BYTES)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def __getstate__(self):
+        return {'budget_mb': self.budget_mb}
+    
+    def __setstate__(self, state):
+        self.__init__(state['budget_mb'])
+    
+    def flags(self, masks, connectivity_checker, triangle_checker):
+        """Predicate flags for a list of int masks, testing only the misses.
+
+        Returns (flags, hits).
+        """
+        out = [0] * len(masks)
+        missing = []
+        with self._lock:
+            entries = self._entries
+            for i, m in enumerate(masks):
+                f = entries.get(m)
+                if f is None:
+                    missing.append(i)
+                else:
+                    entries.move_to_end(m)
+                    out[i] = f
+        if missing:
+            miss_masks = [masks[i] for i in missing]
+            if triangle_checker.triangle_mask_array is not None:
+                arr = np.array(miss_masks, dtype=np.uint64)
+                connected = connectivity_checker.is_connected_batch(arr).tolist()
+                triangle = triangle_checker.contains_triangle_batch(arr).tolist()
             else:
-                # No triangles to check, all connected are valid
-                chunk_valid += len(connected_indices)
+                connected = connectivity_checker.is_connected_vectorized(miss_masks)
+                triangle = triangle_checker.contains_triangle_vectorized(miss_masks)
+            with self._lock:
+                for i, m, c, t in zip(missing, miss_masks, connected, triangle):
+                    f = (self.CONNECTED if c else 0) | (self.TRIANGLE if t else 0)
+                    out[i] = f
+                    self._entries[m] = f
+                while len(self._entries) > self.capacity:
+                    self._entries.popitem(last=False)
+        return out, len(masks) - len(missing)
+
+def count_mask_range(cycle_masks, lo, hi, connectivity_checker, triangle_checker,
+                     batch_bits=None, predicate_cache=None, counters=None):
+    """Connected and valid counts over the cycle unions with index in [lo, hi).
+
+    Union ``i`` is the OR of the cycles whose bit is set in ``i``. The range
+    is walked in power-of-two aligned batches: the low cycles are expanded
+    once into a table and each batch ORs its common high part onto it, so
+    memory stays bounded by the batch size.
+
+    With a ``predicate_cache`` (PredicateCache) masks are looked up there
+    first. ``counters`` (a Counter) receives masks_evaluated,
+    connectivity_checks, triangle_rejections, shortcut_batches and the
+    predicate cache hits and misses.
+    """
+    if counters is None:
+        counters = Counter()
+    use_numpy = connectivity_checker.nE <= 64 and connectivity_checker.nV <= 64
+    if batch_bits is None:
+        batch_bits = (NUMPY_BATCH_SIZE if use_numpy else SCALAR_BATCH_SIZE).bit_length() - 1
+    batch_bits = min(batch_bits, len(cycle_masks))
+    while batch_bits and (lo | hi) & ((1 << batch_bits) - 1):
+        batch_bits -= 1
+    
+    low_masks = cycle_masks[:batch_bits]
+    if use_numpy:
+        low_table = cycle_union_table(low_masks)
+    else:
+        low_table = [0]
+        for m in low_masks:
+            low_table += [u | m for u in low_table]
+    low_edges = 0
+    for m in low_masks:
+        low_edges |= m
     
-    print(f"  Chunk {chunk_id}: Completed!")
-    return chunk_all, chunk_conn, chunk_valid
+    n_conn = 0
+    n_valid = 0
+    for start in range(lo, hi, 1 << batch_bits):
+        high = 0
+        bits = start >> batch_bits
+        j = batch_bits
+        while bits:
+            if bits & 1:
+                high |= cycle_masks[j]
+            bits >>= 1
+            j += 1
+        all_connected, has_triangle = batch_shortcuts(
+            high, low_edges, connectivity_checker, triangle_checker)
+        counters['masks_evaluated'] += len(low_table)
+        counters['shortcut_batches'] += all_connected or has_triangle
+        
+        # Connectivity check, then the triangle filter on connected masks only
+        if predicate_cache is not None and not (all_connected and has_triangle):
+            if use_numpy:
+                masks = (low_table | np.uint64(high)).tolist()
+            else:
+                masks = [u | high for u in low_table]
+            flags, hits = predicate_cache.flags(masks, connectivity_checker, triangle_checker)
+            counters['predicate_cache_hits'] += hits
+            counters['predicate_cache_misses'] += len(masks) - hits
+            counters['connectivity_checks'] += len(masks) - hits
+            connected = PredicateCache.CONNECTED
+            conn = sum(1 for f in flags if f & connected)
+            valid = 0 if has_triangle else flags.count(connected)
+        elif use_numpy:
+            conn, valid = connected_and_valid_block(
+                low_table | np.uint64(high), connectivity_checker, triangle_checker,
+                all_connected, has_triangle)
+            counters['connectivity_checks'] += 0 if all_connected else len(low_table)
+        else:
+            masks = [u | high for u in low_table]
+            if not all_connected:
+                counters['connectivity_checks'] += len(masks)
+                masks = [m for m, ok in zip(masks, connectivity_checker.is_connected_vectorized(masks)) if ok]
+            conn = len(masks)
+            valid = 0
+            if not has_triangle:
+                valid = sum(1 for t in triangle_checker.contains_triangle_vectorized(masks) if not t)
+        n_conn += conn
+        n_valid += valid
+        counters['triangle_rejections'] += conn - valid
+    return n_conn, n_valid
+
+def triangle_edge_indices(edges, triangular_faces):
+    """Edge index tuples of the faces to filter.
+
+    A triangle whose three edges exist gives its three edges. Triangles
+    missing exactly one edge are halves of a split square (the cube's
+    CubF_tri list): two halves sharing the same missing diagonal give the
+    square's four boundary edges.
+    """
+    edge_to_idx = {tuple(sorted(e)): i for i, e in enumerate(edges)}
+    triangles = []
+    halves = {}
+    for a, b, c in triangular_faces:
+        keys = [tuple(sorted(p)) for p in ((a, b), (b, c), (c, a))]
+        present = [edge_to_idx[k] for k in keys if k in edge_to_idx]
+        if len(present) == 3:
+            triangles.append(tuple(present))
+        elif len(present) == 2:
+            diagonal = next(k for k in keys if k not in edge_to_idx)
+            halves.setdefault(diagonal, []).append(present)
+    for parts in halves.values():
+        if len(parts) == 2:
+            triangles.append(tuple(parts[0] + parts[1]))
+    return triangles
+
+def order_cycles_for_frontier(cycsets, edges):
+    """Greedy cycle order keeping the frontier (vertices shared by processed
+    and unprocessed cycles) as small as possible."""
+    cycle_vertices = [{v for e in cyc for v in edges[e]} for cyc in cycsets]
+    pending = {}
+    for verts in cycle_vertices:
+        for v in verts:
+            pending[v] = pending.get(v, 0) + 1
+
+    remaining = set(range(len(cycsets)))
+    frontier = set()
+    order = []
+    while remaining:
+        def frontier_after(k):
+            grown = frontier | cycle_vertices[k]
+            return sum(1 for v in grown
+                       if pending[v] - (v in cycle_vertices[k]) > 0)
+        best = min(remaining, key=lambda k: (frontier_after(k),
+                                             -len(frontier & cycle_vertices[k]), k))
+        remaining.remove(best)
+        order.append(best)
+        for v in cycle_vertices[best]:
+            pending[v] -= 1
+        frontier = {v for v in frontier | cycle_vertices[best] if pending[v] > 0}
+    return order
+
+def _canonical_labels(labels):
+    """Renumber component labels by first occurrence (0 stays 'unused')."""
+    relabel = {0: 0}
+    out = []
+    for lab in labels:
+        if lab not in relabel:
+            relabel[lab] = len(relabel)
+        out.append(relabel[lab])
+    return tuple(out)
+
+def count_frontier(cycsets, edges, triangular_faces):
+    """Exact (all, connected, valid) counts of cycle unions via a frontier DP.
+
+    Cycles are decided one at a time in ``order_cycles_for_frontier`` order.
+    A state records, for each frontier vertex, which component it belongs to
+    (0 = unused), whether a component has already been closed off, and which
+    triangles touched so far still have all their processed edges chosen
+    (``None`` once a full triangle has been chosen). States reaching the
+    same key are merged, so the cost depends on the frontier width rather
+    than on 2^c.
+    """
+    order = order_cycles_for_frontier(cycsets, edges)
+    cycle_vertices = [sorted({v for e in cyc for v in edges[e]}) for cyc in cycsets]
+
+    last_step = {}
+    edge_step = {}
+    for step, k in enumerate(order):
+        for v in cycle_vertices[k]:
+            last_step[v] = step
+        for e in cycsets[k]:
+            edge_step[e] = step
+
+    triangles = [tri for tri in triangle_edge_indices(edges, triangular_faces)
+                 if all(e in edge_step for e in tri)]
+    touch_masks = [0] * len(order)   # triangles touched by the cycle at each step
+    finish_masks = [0] * len(order)  # triangles whose last edge is decided at each step
+    for t, tri in enumerate(triangles):
+        for e in tri:
+            touch_masks[edge_step[e]] |= 1 << t
+        finish_masks[max(edge_step[e] for e in tri)] |= 1 << t
+
+    all_live = (1 << len(triangles)) - 1
+    frontier = []
+    states = {((), False, all_live): 1}
+
+    for step, k in enumerate(order):
+        new_vertices = [v for v in cycle_vertices[k] if v not in frontier]
+        ext_frontier = frontier + new_vertices
+        pos = {v: i for i, v in enumerate(ext_frontier)}
+        cycle_edges = [(pos[edges[e][0]], pos[edges[e][1]]) for e in cycsets[k]]
+        forget = [v for v in ext_frontier if last_step[v] == step]
+        next_frontier = [v for v in ext_frontier if last_step[v] != step]
+        keep_pos = [pos[v] for v in next_frontier]
+        forget_pos = [pos[v] for v in forget]
+        padding = (0,) * len(new_vertices)
+
+        next_states = {}
+        for (labels, closed, live), count in states.items():
+            base = labels + padding
+            for take in (False, True):
+                if take:
+                    if closed:
+                        continue  # new edges would start a second component
+                    labs = list(base)
+                    fresh = max(labs, default=0) + 1
+                    for a, b in cycle_edges:
+                        for p in (a, b):
+                            if labs[p] == 0:
+                                labs[p] = fresh
+                                fresh += 1
+                        la, lb = labs[a], labs[b]
+                        if la != lb:
+                            labs = [la if x == lb else x for x in labs]
+                    new_live = live
+                else:
+                    labs = list(base)
+                    new_live = None if live is None else live & ~touch_masks[step]
+
+                if new_live is not None and new_live & finish_masks[step]:
+                    new_live = None
+                elif new_live is not None:
+                    new_live |= finish_masks[step]  # finished triangles back to canonical
+
+                new_closed = closed
+                kept = [labs[p] for p in keep_pos]
+                leaving = {labs[p] for p in forget_pos} - set(kept) - {0}
+                disconnected = False
+                if leaving:
+                    # These components leave the frontier for good
+                    if len(leaving) > 1 or any(kept) or new_closed:
+                        disconnected = True
+                    new_closed = True
+                if disconnected:
+                    continue
+                key = (_canonical_labels(kept), new_closed, new_live)
+                next_states[key] = next_states.get(key, 0) + count
+        states = next_states
+        frontier = next_frontier
+
+    total_conn = sum(states.values())
+    total_valid = sum(count for (_, _, live), count in states.items() if live is not None)
+    return 1 << len(cycsets), total_conn, total_valid
+
+def edge_perm_from_cycles(cycsets, n_edges):
+    """Rebuild an edge permutation from ordered cycles (cycle[i] -> cycle[i+1])."""
+    perm = [None] * n_edges
+    for cyc in cycsets:
+        cyc = list(cyc)
+        for i, e in enumerate(cyc):
+            perm[e] = cyc[(i + 1) % len(cyc)]
+    return perm
+
+def vertex_perm_from_edge_perm(edge_perm, edges):
+    """Recover the vertex permutation induced by an edge permutation.
+
+    A vertex is the common endpoint of any two of its edges, so its image is
+    the common endpoint of their images.
+    """
+    n_vertices = max(max(e) for e in edges) + 1
+    incident = [[] for _ in range(n_vertices)]
+    for i, (a, b) in enumerate(edges):
+        incident[a].append(i)
+        incident[b].append(i)
+    vperm = []
+    for v, inc in enumerate(incident):
+        if len(inc) < 2:
+            raise ValueError(f"Vertex {v} has degree {len(inc)}; need at least 2")
+        common = set(edges[edge_perm[inc[0]]]) & set(edges[edge_perm[inc[1]]])
+        vperm.append(common.pop())
+    return vperm
+
+def count_triangle_free_unions(cycle_masks, tri_masks, edge_rank=None):
+    """Number of unions of the given cycles (edge bitmasks) with no full triangle.
+
+    Cycles are decided in ``edge_rank`` order; a state keeps only the chosen
+    edges of triangles that are not fully decided yet.
+    """
+    covered = 0
+    for m in cycle_masks:
+        covered |= m
+    tris = [t for t in tri_masks if t & covered == t]
+    relevant = [m for m in cycle_masks if any(m & t for t in tris)]
+    free_bits = len(cycle_masks) - len(relevant)
+    if not tris:
+        return 1 << len(cycle_masks)
+
+    def first_rank(m):
+        low = (m & -m).bit_length() - 1
+        return edge_rank[low] if edge_rank is not None else low
+    relevant.sort(key=first_rank)
+
+    decided = 0
+    states = {0: 1}
+    for m in relevant:
+        decided |= m
+        finished = [t for t in tris if t & m and t & decided == t]
+        active = 0
+        for t in tris:
+            if t & decided != t:
+                active |= t
+        next_states = {}
+        for s, count in states.items():
+            for chosen in (s, s | m):
+                if any(chosen & t == t for t in finished):
+                    continue
+                key = chosen & active
+                next_states[key] = next_states.get(key, 0) + count
+        states = next_states
+    return sum(states.values()) << free_bits
 
-def burnside_counts_optimized(V, E, edge_perms, tri_faces, solid_name="", num_workers=None):
-    """Optimized Burnside counting with parallelization and vectorization."""
-    print(f"Computing optimized Burnside counts for {solid_name}...")
+def _primes_below(limit, count):
+    """The ``count`` largest primes below ``limit`` (trial division)."""
+    primes = []
+    n = limit - 1
+    while len(primes) < count:
+        if n % 2 and all(n % d for d in range(3, math.isqrt(n) + 1, 2)):
+            primes.append(n)
+        n -= 1
+    return primes
+
+def _popcounts(n):
+    """Number of set bits of every index in range(2^n)."""
+    idx = np.arange(1 << n)
+    counts = np.zeros(1 << n, dtype=np.int64)
+    for v in range(n):
+        counts += (idx >> v) & 1
+    return counts
+
+def _subset_transform(f, n, p, inverse=False):
+    """Zeta (sum over subsets) or Mobius transform of f modulo p.
+
+    Inputs are below p < 2^31, so the 2^n partial sums fit in int64 for
+    n <= 31 and a single reduction at the end suffices.
+    """
+    f = f.copy()
+    for i in range(n):
+        view = f.reshape(-1, 2, 1 << i)
+        if inverse:
+            view[:, 1, :] -= view[:, 0, :]
+        else:
+            view[:, 1, :] += view[:, 0, :]
+    return f % p
+
+def connected_subset_counts(all_counts, n, max_bits):
+    """Connected counts c(S) from all counts a(S) over the subsets of n vertices.
+
+    Every edge set inside S splits uniquely into the component of a marked
+    vertex and an arbitrary edge set on the rest, so
+    |S| a(S) = sum_{T subset S} |T| c(T) a(S \\ T), the rooted-split
+    recurrence. It is solved rank by rank with ranked zeta/Mobius transforms
+    in O(n^2 2^n), modulo enough primes near 2^31 to recover values below
+    2^max_bits exactly.
+    """
+    size = 1 << n
+    ranks = _popcounts(n)
+
+    primes = _primes_below(1 << 31, max_bits // 30 + 1)
+    residues = []
+    for p in primes:
+        a = (np.asarray(all_counts) % p).astype(np.int64)
+        a_hat = [_subset_transform(np.where(ranks == j, a, 0), n, p) for j in range(n + 1)]
+        c_hat = [None] * (n + 1)
+        c = np.zeros(size, dtype=np.int64)
+        for k in range(1, n + 1):
+            acc = np.zeros(size, dtype=np.int64)
+            for j in range(1, k):
+                acc = (acc + (j * c_hat[j] % p) * a_hat[k - j]) % p
+            split = _subset_transform(acc, n, p, inverse=True)
+            sel = ranks == k
+            c[sel] = (a[sel] - split[sel] * pow(k, -1, p)) % p
+            c_hat[k] = _subset_transform(np.where(sel, c, 0), n, p)
+        residues.append(c)
+
+    if len(primes) == 1:
+        return residues[0]
+    # Chinese remaindering into exact Python integers
+    result = np.zeros(size, dtype=object)
+    modulus = 1
+    for p, r in zip(primes, residues):
+        r = r.astype(object)
+        t = ((r - result) * pow(modulus, -1, p)) % p
+        result = result + modulus * t
+        modulus *= p
+    return result
+
+# The vertex engine keeps tables over all 2^V vertex subsets
+VERTEX_ENGINE_MAX_VERTICES = 24
+
+class VertexSubsetCounter:
+    """Connected fixed-subset counts via a DP over vertex subsets.
+
+    For the identity, all edge sets inside each vertex subset are inverted to
+    connected ones with ``connected_subset_counts`` (O(V^2 2^V) instead of
+    O(2^E)). For a rotation g only g-invariant vertex subsets can be used.
+    The component of the lowest vertex of a disconnected fixed subset is
+    carried by g through d disjoint copies, so the split term is either an
+    ordinary invariant split or a connected g^d-invariant subset on one
+    representative of each vertex orbit, which recurses into the tables of
+    g^d.
+    """
+
+    def __init__(self, edges, triangular_faces):
+        self.edges = [tuple(e) for e in edges]
+        self.nV = max(max(e) for e in edges) + 1
+        if self.nV > VERTEX_ENGINE_MAX_VERTICES:
+            raise ValueError(f"The vertex engine supports at most {VERTEX_ENGINE_MAX_VERTICES} "
+                             f"vertices, got {self.nV}")
+        self.nE = len(edges)
+        self.edge_vmasks = [(1 << a) | (1 << b) for a, b in self.edges]
+        self.tri_masks = [sum(1 << e for e in tri)
+                          for tri in triangle_edge_indices(self.edges, triangular_faces)]
+        identity_order = order_cycles_for_frontier([[e] for e in range(self.nE)], self.edges)
+        self.edge_rank = [0] * self.nE
+        for rank, e in enumerate(identity_order):
+            self.edge_rank[e] = rank
+        self._identity = None
+        self._tables = {}
+
+    def count(self, cycsets):
+        """(all, connected, valid) fixed-subset counts for one element."""
+        eperm = edge_perm_from_cycles(cycsets, self.nE)
+        if eperm == list(range(self.nE)):
+            conn_table, valid_table = self._identity_tables()
+            multi = _popcounts(self.nV) >= 2
+            conn = 1 + int(conn_table[multi].sum())
+            valid = 1 + int(valid_table[multi].sum())
+        else:
+            tables = self._element_tables(eperm)
+            conn = 1 + sum(c for s, (c, _) in tables.items() if s & (s - 1))
+            valid = 1 + sum(v for s, (_, v) in tables.items() if s & (s - 1))
+        return 1 << len(cycsets), conn, valid
+
+    def _identity_tables(self):
+        if self._identity is None:
+            size = 1 << self.nV
+            idx = np.arange(size)
+            inside = [np.zeros(size, dtype=bool) for _ in range(self.nE)]
+            n_inside = np.zeros(size, dtype=np.int64)
+            for e, (a, b) in enumerate(self.edges):
+                inside[e] = (((idx >> a) & 1) & ((idx >> b) & 1)).astype(bool)
+                n_inside += inside[e]
+            if self.nE < 63:
+                all_counts = np.left_shift(np.int64(1), n_inside)
+            else:
+                all_counts = np.array([1 << int(k) for k in n_inside], dtype=object)
+            if self.tri_masks:
+                tf_counts = []
+                for s in range(size):
+                    masks = [1 << e for e in range(self.nE) if inside[e][s]]
+                    tf_counts.append(count_triangle_free_unions(masks, self.tri_masks, self.edge_rank))
+                tf_counts = np.array(tf_counts, dtype=object)
+            else:
+                tf_counts = all_counts
+            conn = connected_subset_counts(all_counts, self.nV, self.nE + 1)
+            valid = conn if tf_counts is all_counts else \
+                connected_subset_counts(tf_counts, self.nV, self.nE + 1)
+            self._identity = (conn, valid)
+        return self._identity
+
+    def _lookup(self, eperm, s):
+        if eperm == list(range(self.nE)):
+            conn, valid = self._identity_tables()
+            return int(conn[s]), int(valid[s])
+        return self._element_tables(eperm)[s]
+
+    def _element_tables(self, eperm):
+        key = tuple(eperm)
+        if key in self._tables:
+            return self._tables[key]
+
+        vperm = vertex_perm_from_edge_perm(eperm, self.edges)
+        orbits = cycles_of_perm(vperm)   # each orbit starts at its minimum
+        orbit_masks = [sum(1 << v for v in o) for o in orbits]
+        edge_cycles = cycles_of_perm(eperm)
+        cycle_masks = [sum(1 << e for e in cyc) for cyc in edge_cycles]
+        cycle_vmasks = [0] * len(edge_cycles)
+        for i, cyc in enumerate(edge_cycles):
+            for e in cyc:
+                cycle_vmasks[i] |= self.edge_vmasks[e]
+
+        order = 1
+        for o in orbits:
+            order = order * len(o) // math.gcd(order, len(o))
+        powers = {}
+        q = list(range(self.nE))
+        for d in range(1, order + 1):
+            q = [eperm[e] for e in q]
+            powers[d] = q
+
+        # Invariant vertex subsets as sets of orbit indices, smallest first
+        subsets = sorted(range(1, 1 << len(orbits)), key=lambda m: bin(m).count('1'))
+        def vmask(sel):
+            return sum(orbit_masks[i] for i in range(len(orbits)) if (sel >> i) & 1)
+
+        all_counts = {0: (1, 1)}
+        for sel in subsets:
+            s = vmask(sel)
+            inside = [cycle_masks[i] for i in range(len(edge_cycles))
+                      if cycle_vmasks[i] & s == cycle_vmasks[i]]
+            all_counts[s] = (1 << len(inside),
+                             count_triangle_free_unions(inside, self.tri_masks, self.edge_rank))
+
+        tables = {}
+        transitive = {}
+        for sel in subsets:
+            s = vmask(sel)
+            members = [i for i in range(len(orbits)) if (sel >> i) & 1]
+            root = min(members, key=lambda i: orbits[i][0])
+            rest = [i for i in members if i != root]
+
+            # Orbits of components of length d > 1: one g^d-orbit per g-orbit
+            spread = [0, 0]
+            lengths = [len(orbits[i]) for i in members]
+            g = 0
+            for length in lengths:
+                g = math.gcd(g, length)
+            for d in range(2, g + 1):
+                if g % d:
+                    continue
+                for choice in itertools.product(range(d), repeat=len(rest)):
+                    w = sum(1 << v for v in orbits[root][::d])
+                    for i, j in zip(rest, choice):
+                        w |= sum(1 << v for v in orbits[i][j::d])
+                    c_w, v_w = self._lookup(powers[d], w)
+                    spread[0] += c_w
+                    spread[1] += v_w
+
+            split = [0, 0]
+            for sub in range(1 << len(rest)):
+                if sub == (1 << len(rest)) - 1:
+                    continue
+                u = orbit_masks[root]
+                for k, i in enumerate(rest):
+                    if (sub >> k) & 1:
+                        u |= orbit_masks[i]
+                t_u = transitive[u]
+                a_rest = all_counts[s & ~u]
+                split[0] += t_u[0] * a_rest[0]
+                split[1] += t_u[1] * a_rest[1]
+
+            a_s = all_counts[s]
+            conn = a_s[0] - split[0] - spread[0]
+            valid = a_s[1] - split[1] - spread[1]
+            tables[s] = (conn, valid)
+            transitive[s] = (conn + spread[0], valid + spread[1])
+
+        self._tables[key] = tables
+        return tables
+
+_VERTEX_COUNTERS = {}
+
+def count_vertex_subsets(cycsets, edges, triangular_faces):
+    """(all, connected, valid) counts with a per-process VertexSubsetCounter."""
+    key = (tuple(tuple(e) for e in edges), tuple(tuple(t) for t in triangular_faces))
+    if key not in _VERTEX_COUNTERS:
+        _VERTEX_COUNTERS[key] = VertexSubsetCounter(edges, triangular_faces)
+    return _VERTEX_COUNTERS[key].count(cycsets)
+
+# Counting engines selectable with --engine
+ENGINES = ('frontier', 'vertex', 'enumerate')
+
+def plan_work_units(items, engine, unit_bits=WORK_UNIT_BITS):
+    """Split (cycles, weight) items into (item index, lo, hi) work units.
+
+    The enumerate engine cuts elements with more than 2^unit_bits cycle
+    unions into aligned mask ranges of that size; the DP engines count an
+    element in one go. Units are sorted by estimated cost (hi - lo, i.e.
+    2^c for a whole element), largest first, so the expensive ones start
+    early and the cheap ones fill the gaps at the end.
+    """
+    units = []
+    for idx, (cycsets, _) in enumerate(items):
+        total = 1 << len(cycsets)
+        step = min(total, 1 << unit_bits) if engine == 'enumerate' else total
+        units.extend((idx, lo, lo + step) for lo in range(0, total, step))
+    units.sort(key=lambda u: u[2] - u[1], reverse=True)
+    return units
+
+# Work units whose total estimated cost is below this run in the calling
+# process; dispatching them would cost more than counting them
+INLINE_COST_LIMIT = 1 << 16
+
+def partition_key(edges, triangular_faces, cycsets):
+    """Hash of the edges, triangles and the cycle partition of an element.
+
+    The subsets an element fixes are the unions of its cycles, so its
+    (all, connected, valid) counts depend on nothing else: elements with
+    the same partition (g and g^k generating the same cyclic subgroup, or
+    the same element in another run) share a key.
+    """
+    partition = sorted(tuple(sorted(cyc)) for cyc in cycsets)
+    return hashlib.sha256(repr((edges, triangular_faces, partition)).encode()).hexdigest()
+
+def burnside_classes(edges, triangular_faces, edge_perms):
+    """Conjugacy classes of an edge permutation group, merged by partition.
+
+    Conjugate rotations fix equally many connected / valid subsets, so one
+    representative per conjugacy class is evaluated and weighted by its size.
+    Each class is represented by its member with the smallest partition key,
+    so classes sharing their partitions (rotations by 72 and by 144 degrees)
+    merge into one item.
+
+    Returns (class id of every element, representatives, weights).
+    """
+    edges = [tuple(e) for e in edges]
+    triangular_faces = [tuple(t) for t in triangular_faces]
+    index = {tuple(p): i for i, p in enumerate(edge_perms)}
+    class_ids = [0] * len(edge_perms)
+    items = {}
+    for c, members in enumerate(conjugacy_class_members(edge_perms)):
+        for perm in members:
+            class_ids[index[perm]] = c
+        key, perm = min(
+            (partition_key(edges, triangular_faces,
+                           [list(cycle) for cycle in cycles_of_perm(perm)]), perm)
+            for perm in members)
+        if key in items:
+            items[key][1] += len(members)
+        else:
+            items[key] = [perm, len(members)]
+    return (class_ids, [perm for perm, _ in items.values()],
+            [weight for _, weight in items.values()])
+
+class SolidState:
+    """Read-only per-solid data shared by all work units of a solid.
+
+    Holds the items (cycles, weight) to count, their cycle edge masks, the
+    bitmask checkers and, with a ``predicate_cache_mb`` budget, a
+    PredicateCache. Each process gets it once (see install_solid_states)
+    and tasks refer to it by solid id, so nothing but a few integers is
+    pickled per task. ``classes`` takes a precomputed burnside_classes
+    result and ``cycles`` the cycles_of_perm of each of its representatives
+    (both e.g. from a solid pack).
+    """
     
-    if num_workers is None:
-        num_workers = min(cpu_count(), len(edge_perms))
-    
-    # Precompute cycle decompositions
-    print(f"  Computing {len(edge_perms)} cycle decompositions...")
-    cycsets_per_perm = []
-    for i, perm in enumerate(edge_perms):
-        if i % 20 == 0:
-            print(f"    Cycles: {i+1}/{len(edge_perms)}")
+    def __init__(self, vertices, edges, edge_perms, triangular_faces, predicate_cache_mb=0,
+                 classes=None, cycles=None):
+        self.edges = [tuple(e) for e in edges]
+        self.triangular_faces = [tuple(t) for t in triangular_faces]
+        self.group_order = len(edge_perms)
         
-        cycles = cycles_of_perm(perm)
-        cycsets = [set(cycle) for cycle in cycles]  # Keep as edge indices, not edge tuples
-        cycsets_per_perm.append(cycsets)
-    
-    # Split permutations into chunks for parallel processing
-    chunk_size = max(1, len(cycsets_per_perm) // num_workers)
-    chunks = []
-    for i in range(0, len(cycsets_per_perm), chunk_size):
-        chunk = cycsets_per_perm[i:i + chunk_size]
-        chunks.append((chunk, V, E, tri_faces, len(chunks)))
-    
-    print(f"  Processing {len(chunks)} chunks with {num_workers} workers...")
-    
-    # Parallel processing
-    if num_workers > 1:
-        with Pool(num_workers) as pool:
-            results = pool.map(process_permutation_chunk, chunks)
+        if classes is None:
+            classes = burnside_classes(self.edges, self.triangular_faces, edge_perms)
+        class_ids, representatives, weights = classes
+        self.class_ids = [int(c) for c in class_ids]
+        self.representatives = [tuple(int(e) for e in perm) for perm in representatives]
+        self.n_classes = max(self.class_ids) + 1
+        if cycles is None:
+            cycles = [cycles_of_perm(perm) for perm in self.representatives]
+        # Cycles keep their order: cycle[i] -> cycle[i+1]
+        self.items = [([list(cycle) for cycle in cycsets], int(weight))
+                      for cycsets, weight in zip(cycles, weights)]
+        self.partition_keys = [partition_key(self.edges, self.triangular_faces, cycsets)
+                               for cycsets, _ in self.items]
+        self.cycle_masks = [[sum(1 << e for e in cyc) for cyc in cycsets]
+                            for cycsets, _ in self.items]
+        self.connectivity_checker = ConnectivityChecker(vertices, self.edges)
+        self.triangle_checker = TriangleChecker(self.edges, self.triangular_faces)
+        self.predicate_cache = PredicateCache(predicate_cache_mb) if predicate_cache_mb > 0 else None
+        # Identifies the counting problem (not the solid's name) in checkpoints
+        self.fingerprint = hashlib.sha256(
+            repr((self.edges, self.triangular_faces, self.items)).encode()).hexdigest()[:16]
+
+class ResultCache:
+    """On-disk (fixed all, fixed connected, fixed valid) counts per element.
+
+    An SQLite table keyed by partition_key. All engines give the same
+    counts, so entries are shared between them.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.execute("CREATE TABLE IF NOT EXISTS fixed_counts ("
+                         "key TEXT PRIMARY KEY, n_all INTEGER, n_connected INTEGER, n_valid INTEGER)")
+        self._db.commit()
+    
+    def get(self, key):
+        row = self._db.execute("SELECT n_all, n_connected, n_valid FROM fixed_counts WHERE key = ?",
+                               (key,)).fetchone()
+        return tuple(row) if row is not None else None
+    
+    def put_many(self, entries):
+        """Store {key: (all, connected, valid)} in one transaction."""
+        self._db.executemany("INSERT OR REPLACE INTO fixed_counts VALUES (?, ?, ?, ?)",
+                             [(key, *counts) for key, counts in entries.items()])
+        self._db.commit()
+    
+    def close(self):
+        self._db.close()
+
+# SolidState objects of this process by solid id; pool workers fill it once
+# from the initializer
+_SOLID_STATES = {}
+
+def install_solid_states(states):
+    """Register {solid id: SolidState} in this process (pool initializer)."""
+    _SOLID_STATES.update(states)
+
+# Executor backends selectable with --backend
+BACKENDS = ('serial', 'process', 'thread', 'futures')
+
+def default_backend():
+    """'thread' on free-threaded CPython builds, 'process' otherwise."""
+    gil_enabled = getattr(sys, '_is_gil_enabled', lambda: True)()
+    return 'process' if gil_enabled else 'thread'
+
+class SerialExecutor:
+    """Runs work units one after another in the calling process."""
+    
+    def imap_unordered(self, fn, tasks):
+        return map(fn, tasks)
+    
+    def close(self):
+        pass
+    
+    def join(self):
+        pass
+    
+    def terminate(self):
+        pass
+
+class FuturesExecutor:
+    """concurrent.futures ProcessPoolExecutor behind the Pool interface."""
+    
+    def __init__(self, num_workers, states):
+        self._executor = ProcessPoolExecutor(num_workers, initializer=install_solid_states,
+                                             initargs=(states,))
+    
+    def imap_unordered(self, fn, tasks):
+        futures = [self._executor.submit(fn, task) for task in tasks]
+        return (future.result() for future in as_completed(futures))
+    
+    def close(self):
+        pass
+    
+    def join(self):
+        self._executor.shutdown(wait=True)
+    
+    def terminate(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+def make_executor(backend, num_workers, states):
+    """Executor for work units, with ``states`` installed for its workers.
+
+    Every executor has Pool's ``imap_unordered``, ``close``, ``join`` and
+    ``terminate``; see shutdown_executor.
+    'serial' counts in the calling process; 'process' and 'futures' start
+    worker processes that receive the states once, from the initializer;
+    'thread' runs a ThreadPool over this process's states, sharing the
+    bitmask tables without copying or pickling anything.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend: {backend}")
+    install_solid_states(states)
+    if backend == 'serial':
+        return SerialExecutor()
+    if backend == 'thread':
+        return ThreadPool(num_workers)
+    if backend == 'futures':
+        return FuturesExecutor(num_workers, states)
+    return Pool(num_workers, initializer=install_solid_states, initargs=(states,))
+
+class LazyExecutor:
+    """make_executor on first use.
+
+    The states are installed in this process right away, for the units run
+    in-process; worker processes or threads are only started when work is
+    actually dispatched, so a run whose units all stay under
+    INLINE_COST_LIMIT never starts (or pickles states into) a pool.
+    """
+    
+    def __init__(self, backend, num_workers, states):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}")
+        install_solid_states(states)
+        self._args = (backend, num_workers, states)
+        self._executor = None
+    
+    def imap_unordered(self, fn, tasks):
+        if self._executor is None:
+            self._executor = make_executor(*self._args)
+        return self._executor.imap_unordered(fn, tasks)
+    
+    def close(self):
+        if self._executor is not None:
+            self._executor.close()
+    
+    def join(self):
+        if self._executor is not None:
+            self._executor.join()
+    
+    def terminate(self):
+        if self._executor is not None:
+            self._executor.terminate()
+
+def shutdown_executor(executor, failed):
+    """Stop ``executor`` once its caller is done with it.
+
+    After a normal exit the pool is closed and joined. After an exception
+    (KeyboardInterrupt included) nobody collects results any more, so it is
+    terminated instead: joining would wait for every queued unit, and a Pool
+    even replaces workers that were interrupted.
+    """
+    if failed:
+        executor.terminate()
+    else:
+        executor.close()
+        executor.join()
+
+def process_work_unit(args, counters=None):
+    """(all, connected, valid) counts for one work unit.
+
+    A unit is (solid id, item index, lo, hi, engine): the item's cycle
+    unions in [lo, hi). Counts are per element; the caller applies the
+    item's weight. Work done is added to ``counters`` (see
+    count_mask_range); nothing is printed.
+    """
+    solid_id, item_idx, lo, hi, engine = args
+    state = _SOLID_STATES[solid_id]
+    cycsets, _ = state.items[item_idx]
+    
+    if engine in ('frontier', 'vertex'):
+        count_fn = count_frontier if engine == 'frontier' else count_vertex_subsets
+        _, conn, valid = count_fn(cycsets, state.edges, state.triangular_faces)
     else:
-        results = [process_permutation_chunk(chunk) for chunk in chunks]
+        conn, valid = count_mask_range(state.cycle_masks[item_idx], lo, hi,
+                                       state.connectivity_checker, state.triangle_checker,
+                                       predicate_cache=state.predicate_cache,
+                                       counters=counters)
+    
+    return hi - lo, conn, valid
+
+def keyed_work_unit(task):
+    """(task, unit result, unit metrics) for collect_unit_results.
+
+    The task lets unordered results be matched back to their units; the
+    metrics (worker, seconds, counters) are aggregated by the calling
+    process's Instrumentation instead of being printed here.
+    """
+    counters = Counter()
+    start = time.perf_counter()
+    result = process_work_unit(task, counters)
+    metrics = {'worker': f"{os.getpid()}/{threading.current_thread().name}",
+               'seconds': time.perf_counter() - start,
+               'counters': dict(counters)}
+    return task, result, metrics
+
+class Checkpoint:
+    """Completed work-unit results, kept in a JSON file for --resume.
+
+    Units are keyed by the solid's fingerprint, the engine and the unit's
+    (class index, lo, hi), so results of a different solid, group or
+    engine are never reused. The file is rewritten atomically (temporary
+    file, then os.replace) at most every ``interval`` seconds and on save().
+    """
+    
+    def __init__(self, path, interval=60.0, resume=False):
+        self.path = path
+        self.interval = interval
+        self.units = {}
+        if resume and os.path.exists(path):
+            with open(path) as f:
+                self.units = json.load(f)["units"]
+        self._last_save = time.time()
+        self._dirty = False
+    
+    @staticmethod
+    def unit_key(state, task):
+        _, item_idx, lo, hi, engine = task
+        return f"{state.fingerprint}:{engine}:{item_idx}:{lo}:{hi}"
+    
+    def get(self, key):
+        result = self.units.get(key)
+        return tuple(result) if result is not None else None
+    
+    def record(self, key, result):
+        self.units[key] = list(result)
+        self._dirty = True
+        if time.time() - self._last_save >= self.interval:
+            self.save()
+    
+    def save(self):
+        if not self._dirty:
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"units": self.units}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self._last_save = time.time()
+        self._dirty = False
+
+class QuietSink:
+    """Discards all instrumentation events."""
+    
+    def handle(self, event, fields):
+        pass
+    
+    def close(self):
+        pass
+
+class ProgressSink:
+    """Human-readable progress for the parent process: messages and phase
+    timings as lines, work units as a progress bar redrawn in place."""
+    
+    def __init__(self, stream=None, width=30):
+        self.stream = stream if stream is not None else sys.stdout
+        self.width = width
+    
+    def handle(self, event, fields):
+        if event == 'message':
+            print(fields['text'], file=self.stream)
+        elif event == 'phase':
+            print(f"  [{fields['name']}] {fields['seconds']:.3f}s", file=self.stream)
+        elif event == 'unit':
+            done, total = fields['done'], fields['total']
+            filled = self.width * done // total
+            end = "\n" if done == total else ""
+            print(f"\r    [{'#' * filled}{'.' * (self.width - filled)}] {done}/{total} work units",
+                  end=end, file=self.stream, flush=True)
+        elif event == 'summary':
+            for name, value in sorted(fields['counters'].items()):
+                print(f"  {name}: {value}", file=self.stream)
+            for worker, w in sorted(fields['workers'].items()):
+                print(f"  worker {worker}: {w['units']} units, {w['seconds']:.2f}s, "
+                      f"{w['masks_per_second']:,.0f} masks/s", file=self.stream)
+    
+    def close(self):
+        self.stream.flush()
+
+class JsonLinesSink:
+    """Writes every event as one JSON object per line."""
+    
+    def __init__(self, path):
+        self._file = open(path, 'a')
+    
+    def handle(self, event, fields):
+        self._file.write(json.dumps({'event': event, 'time': time.time(), **fields}) + "\n")
+        self._file.flush()
+    
+    def close(self):
+        self._file.close()
+
+class Instrumentation:
+    """Phase timers, counters and per-worker throughput, reported to sinks.
+
+    Lives in the parent process only: workers return their counters with
+    each unit result (keyed_work_unit) and collect_unit_results folds them
+    in here. Counters are kept per solid and in total.
+    """
+    
+    def __init__(self, sinks=None):
+        self.sinks = list(sinks) if sinks is not None else [ProgressSink()]
+        self.timers = defaultdict(float)
+        self.counters = Counter()
+        self.solid_counters = defaultdict(Counter)
+        self.workers = defaultdict(lambda: {'units': 0, 'seconds': 0.0, 'masks': 0})
+    
+    def emit(self, event, **fields):
+        for sink in self.sinks:
+            sink.handle(event, fields)
+    
+    def message(self, text):
+        self.emit('message', text=text)
+    
+    @contextlib.contextmanager
+    def phase(self, name, solid=None):
+        """Time the enclosed block as phase ``name``."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.timers[name] += elapsed
+            self.emit('phase', name=name, solid=solid, seconds=elapsed)
     
-    # Aggregate results
-    total_all = sum(r[0] for r in results)
-    total_conn = sum(r[1] for r in results)
-    total_valid = sum(r[2] for r in results)
+    def unit_done(self, solid, task, metrics, done, total):
+        """Fold one unit's metrics in (see keyed_work_unit)."""
+        counters = metrics['counters']
+        self.counters.update(counters)
+        self.counters['units'] += 1
+        self.solid_counters[solid].update(counters)
+        self.solid_counters[solid]['units'] += 1
+        worker = self.workers[metrics['worker']]
+        worker['units'] += 1
+        worker['seconds'] += metrics['seconds']
+        worker['masks'] += task[3] - task[2]
+        self.emit('unit', solid=solid, item=task[1], lo=task[2], hi=task[3],
+                  worker=metrics['worker'], seconds=metrics['seconds'],
+                  counters=counters, done=done, total=total)
     
-    G = len(edge_perms)
-    print(f"  Completed {solid_name}!")
+    def summary(self):
+        """Timers, counters and per-worker throughput (masks per second) so far."""
+        workers = {name: dict(w, masks_per_second=w['masks'] / w['seconds'] if w['seconds'] else 0.0)
+                   for name, w in self.workers.items()}
+        return {'timers': dict(self.timers), 'counters': dict(self.counters), 'workers': workers}
+    
+    def close(self):
+        """Report the summary and close the sinks."""
+        self.emit('summary', **self.summary())
+        for sink in self.sinks:
+            sink.close()
+
+def collect_unit_results(results, n_units, state=None, checkpoint=None,
+                         instrumentation=None, solid=None):
+    """Drain keyed_work_unit results into a list of (task, unit result),
+    handing each unit's metrics to ``instrumentation`` and recording each
+    result in ``checkpoint`` if given."""
+    collected = []
+    for task, r, metrics in results:
+        collected.append((task, r))
+        if checkpoint is not None:
+            checkpoint.record(Checkpoint.unit_key(state, task), r)
+        if instrumentation is not None:
+            instrumentation.unit_done(solid, task, metrics, len(collected), n_units)
+    return collected
+
+def run_units(tasks, collect, total_cost, executor, num_workers, backend, solid_id, state, message):
+    """Run keyed work units where they are cheapest and collect the results.
+
+    Small batches run in the calling process, the rest on ``executor`` or,
+    without one, on an executor of ``backend`` created for this call.
+    """
+    if not tasks:
+        return []
+    if total_cost <= INLINE_COST_LIMIT or (executor is None and num_workers <= 1):
+        message(f"  Processing {len(tasks)} work units in-process...")
+        return collect(map(keyed_work_unit, tasks))
+    if executor is not None:
+        message(f"  Processing {len(tasks)} work units on the shared executor...")
+        return collect(executor.imap_unordered(keyed_work_unit, tasks))
+    num_workers = min(num_workers, len(tasks))
+    message(f"  Processing {len(tasks)} work units with {num_workers} {backend} workers...")
+    own_executor = make_executor(backend, num_workers, {solid_id: state})
+    try:
+        results = collect(own_executor.imap_unordered(keyed_work_unit, tasks))
+    except BaseException:
+        shutdown_executor(own_executor, failed=True)
+        raise
+    shutdown_executor(own_executor, failed=False)
+    return results
+
+def burnside_counts_optimized(V, E, edge_perms, tri_faces, solid_name="", num_workers=None,
+                              engine='frontier', executor=None, solid_id=None, backend=None,
+                              checkpoint=None, cache=None, predicate_cache_mb=0,
+                              instrumentation=None):
+    """Optimized Burnside counting with parallelization and vectorization.
+
+    ``engine`` picks how each element's fixed subsets are counted: 'frontier'
+    runs the frontier DP, 'vertex' the vertex-subset DP and 'enumerate'
+    checks every cycle union.
+
+    ``solid_id`` names a SolidState already installed with
+    install_solid_states / make_executor, and ``executor`` is a persistent
+    executor holding it; V, E, edge_perms and tri_faces are then not
+    re-read. Without them the state is built here and, for several
+    workers, an executor of the given ``backend`` (default_backend() if
+    None) is created for this call only.
+
+    With a ``checkpoint`` (Checkpoint), units already recorded in it are
+    not recomputed and newly finished ones are added to it. With a
+    ``cache`` (ResultCache), elements whose cycle partition is cached need
+    no work units at all, and the others are stored once counted.
+    ``predicate_cache_mb`` sizes the PredicateCache of a state built here.
+    Progress, timings and counters go to ``instrumentation`` (a fresh
+    Instrumentation printing progress if None).
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine: {engine}")
+    if backend is None:
+        backend = default_backend()
+    own_instrumentation = instrumentation is None
+    if own_instrumentation:
+        instrumentation = Instrumentation()
+    message = instrumentation.message
+    message(f"Computing optimized Burnside counts for {solid_name} ({engine} engine)...")
+    
+    if num_workers is None:
+        num_workers = cpu_count()
+    
+    own_state = solid_id is None
+    if own_state:
+        solid_id = f"{solid_name or 'solid'}-{len(_SOLID_STATES)}"
+        _SOLID_STATES[solid_id] = SolidState(V, E, edge_perms, tri_faces, predicate_cache_mb)
+    state = _SOLID_STATES[solid_id]
+    message(f"  {state.group_order} elements in {state.n_classes} conjugacy classes, "
+          f"{len(state.items)} distinct cycle partitions")
+    
+    # Per-element (all, connected, valid) counts by item index
+    item_counts = {}
+    if cache is not None:
+        for i, key in enumerate(state.partition_keys):
+            counts = cache.get(key)
+            if counts is not None:
+                item_counts[i] = counts
+        message(f"  {len(item_counts)} of {len(state.items)} cycle partitions found in {cache.path}")
+    
+    # Split the remaining items into (element, mask range) work units, sized by cost
+    units = [u for u in plan_work_units(state.items, engine) if u[0] not in item_counts]
+    tasks = [(solid_id, i, lo, hi, engine) for i, lo, hi in units]
+    
+    # Units finished in an earlier, interrupted run come from the checkpoint
+    results = []
+    if checkpoint is not None:
+        pending = []
+        for task in tasks:
+            result = checkpoint.get(Checkpoint.unit_key(state, task))
+            if result is None:
+                pending.append(task)
+            else:
+                results.append((task, result))
+        if results:
+            message(f"  Resumed {len(results)} of {len(tasks)} work units from {checkpoint.path}")
+        tasks = pending
+    total_cost = sum(hi - lo for _, _, lo, hi, _ in tasks)
+    collect = partial(collect_unit_results, n_units=len(tasks), state=state, checkpoint=checkpoint,
+                      instrumentation=instrumentation, solid=solid_id)
+    
+    # Idle workers pull the next unit from the executor's shared task queue, so
+    # one expensive element no longer holds up a chunk
+    try:
+        with instrumentation.phase('enumeration', solid=solid_id):
+            results += run_units(tasks, collect, total_cost, executor, num_workers, backend,
+                                 solid_id, state, message)
+    finally:
+        if own_state:
+            del _SOLID_STATES[solid_id]
+        if checkpoint is not None:
+            checkpoint.save()
+    
+    # Aggregate unit results per element, then weight elements by class size
+    counted = {}
+    for (_, i, _, _, _), r in results:
+        counted[i] = tuple(a + b for a, b in zip(counted.get(i, (0, 0, 0)), r))
+    if cache is not None and counted:
+        cache.put_many({state.partition_keys[i]: counts for i, counts in counted.items()})
+    item_counts.update(counted)
+    
+    total_all = sum(state.items[i][1] * c[0] for i, c in item_counts.items())
+    total_conn = sum(state.items[i][1] * c[1] for i, c in item_counts.items())
+    total_valid = sum(state.items[i][1] * c[2] for i, c in item_counts.items())
+    
+    G = state.group_order
+    if state.predicate_cache is not None:
+        counters = instrumentation.solid_counters[solid_id]
+        message(f"  Predicate cache: {counters['predicate_cache_hits']} hits, "
+                f"{counters['predicate_cache_misses']} misses")
+    message(f"  Completed {solid_name}!")
+    if own_instrumentation:
+        instrumentation.close()
     
     return total_all // G, total_conn // G, total_valid // G
 
 # Geometry definitions (same as original but organized)
-def get_platonic_solid_data():
-    """Get geometric data for all Platonic solids."""
+PLATONIC_SOLIDS = ('tetrahedron', 'cube', 'octahedron', 'icosahedron', 'dodecahedron')
+
+def get_platonic_solid_data(split_square_faces=False):
+    """Get geometric data for all Platonic solids.
+
+    With ``split_square_faces`` the cube gets its square faces as pairs of
+    triangles (CubF_tri), so subsets containing a full square are filtered.
+    """
+    return {name: platonic_solid_data(name, split_square_faces) for name in PLATONIC_SOLIDS}
+
+def platonic_solid_data(name, split_square_faces=False):
+    """(vertices, edges, triangles) of one Platonic solid, built on its own.
+
+    ``split_square_faces`` only affects the cube (see get_platonic_solid_data).
+    """
     phi = (1 + 5**0.5) / 2
     
-    # Tetrahedron
-    tet_vertices = np.array([normalize(v) for v in [
-        (1, 1, 1), (-1, -1, 1), (-1, 1, -1), (1, -1, -1)
-    ]], dtype=float)
-    tet_edges = sorted(tuple(sorted(e)) for e in itertools.combinations(range(4), 2))
-    tet_triangles = [(0, 1, 2), (0, 1, 3), (0, 2, 3), (1, 2, 3)]
-    
-    # Cube
-    cube_vertices = np.array([normalize(v) for v in itertools.product([-1, 1], repeat=3)], dtype=float)
-    cube_edges = []
-    for i in range(8):
-        for j in range(i + 1, 8):
-            if np.sum(np.abs(cube_vertices[i] - cube_vertices[j]) > 1e-6) == 1:
-                cube_edges.append((i, j))
-    cube_edges = sorted(cube_edges)
-    cube_triangles = []  # Cube has no triangular faces
-    
-    # Octahedron
-    oct_vertices = np.array([normalize(v) for v in [
-        (1, 0, 0), (-1, 0, 0), (0, 1, 0), (0, -1, 0), (0, 0, 1), (0, 0, -1)
-    ]], dtype=float)
-    oct_edges = []
-    for i in range(6):
-        for j in range(i + 1, 6):
-            if np.isclose(np.dot(oct_vertices[i], oct_vertices[j]), 0.0, atol=1e-9):
-                oct_edges.append((i, j))
-    oct_edges = sorted(oct_edges)
-    oct_triangles = [
-        (0, 2, 4), (0, 2, 5), (0, 3, 4), (0, 3, 5),
-        (1, 2, 4), (1, 2, 5), (1, 3, 4), (1, 3, 5)
-    ]
-    
-    # Icosahedron
-    ico_vertices = np.array([normalize(v) for v in [
-        (0, -1, -phi), (0, -1, phi), (0, 1, -phi), (0, 1, phi),
-        (-1, -phi, 0), (-1, phi, 0), (1, -phi, 0), (1, phi, 0),
-        (-phi, 0, -1), (phi, 0, -1), (-phi, 0, 1), (phi, 0, 1),
-    ]], dtype=float)
-    ico_edges = edges_from_vertices(ico_vertices)
-    ico_triangles = get_triangular_faces(ico_vertices, ico_edges)
-    
-    # Dodecahedron (simplified - use icosahedron dual)
-    dod_vertices = []
-    for a, b, c in ico_triangles:
-        center = normalize((ico_vertices[a] + ico_vertices[b] + ico_vertices[c]) / 3.0)
-        dod_vertices.append(center)
-    dod_vertices = unique_rows(np.array(dod_vertices))
-    dod_edges = edges_from_vertices(dod_vertices)
-    dod_triangles = []  # Dodecahedron has pentagonal faces, no triangles
-    
-    return {
-        'tetrahedron': (tet_vertices, tet_edges, tet_triangles),
-        'cube': (cube_vertices, cube_edges, cube_triangles),
-        'octahedron': (oct_vertices, oct_edges, oct_triangles),
-        'icosahedron': (ico_vertices, ico_edges, ico_triangles),
-        'dodecahedron': (dod_vertices, dod_edges, dod_triangles)
-    }
-
-def edges_from_vertices(vertices):
-    """Find edges as minimal distance pairs."""
-    V = np.array(vertices)
-    n = len(V)
-    distances = []
-    for i in range(n):
-        for j in range(i + 1, n):
-            d = np.linalg.norm(V[i] - V[j])
-            distances.append((d, i, j))
+    if name == 'tetrahedron':
+        tet_vertices = np.array([normalize(v) for v in [
+            (1, 1, 1), (-1, -1, 1), (-1, 1, -1), (1, -1, -1)
+        ]], dtype=float)
+        tet_edges = sorted(tuple(sorted(e)) for e in itertools.combinations(range(4), 2))
+        tet_triangles = [(0, 1, 2), (0, 1, 3), (0, 2, 3), (1, 2, 3)]
+        return tet_vertices, tet_edges, tet_triangles
     
-    distances.sort()
-    edges = set()
-    min_d = distances[0][0]
+    if name == 'cube':
+        cube_vertices = np.array([normalize(v) for v in itertools.product([-1, 1], repeat=3)], dtype=float)
+        cube_edges = []
+        for i in range(8):
+            for j in range(i + 1, 8):
+                if np.sum(np.abs(cube_vertices[i] - cube_vertices[j]) > 1e-6) == 1:
+                    cube_edges.append((i, j))
+        cube_edges = sorted(cube_edges)
+        cube_triangles = []  # Cube has no triangular faces
+        if split_square_faces:
+            for a, b, c, d in [(7, 5, 1, 3), (6, 4, 0, 2), (7, 5, 4, 6),
+                               (3, 1, 0, 2), (5, 1, 0, 4), (7, 3, 2, 6)]:
+                cube_triangles += [(a, b, c), (a, c, d)]
+        return cube_vertices, cube_edges, cube_triangles
     
-    for d, i, j in distances:
-        if abs(d - min_d) < 1e-6:
-            edges.add((i, j))
-        else:
-            break
+    if name == 'octahedron':
+        oct_vertices = np.array([normalize(v) for v in [
+            (1, 0, 0), (-1, 0, 0), (0, 1, 0), (0, -1, 0), (0, 0, 1), (0, 0, -1)
+        ]], dtype=float)
+        oct_edges = []
+        for i in range(6):
+            for j in range(i + 1, 6):
+                if np.isclose(np.dot(oct_vertices[i], oct_vertices[j]), 0.0, atol=1e-9):
+                    oct_edges.append((i, j))
+        oct_edges = sorted(oct_edges)
+        oct_triangles = [
+            (0, 2, 4), (0, 2, 5), (0, 3, 4), (0, 3, 5),
+            (1, 2, 4), (1, 2, 5), (1, 3, 4), (1, 3, 5)
+        ]
+        return oct_vertices, oct_edges, oct_triangles
+    
+    if name == 'icosahedron':
+        ico_vertices = np.array([normalize(v) for v in [
+            (0, -1, -phi), (0, -1, phi), (0, 1, -phi), (0, 1, phi),
+            (-1, -phi, 0), (-1, phi, 0), (1, -phi, 0), (1, phi, 0),
+            (-phi, 0, -1), (phi, 0, -1), (-phi, 0, 1), (phi, 0, 1),
+        ]], dtype=float)
+        ico_edges = edges_from_vertices(ico_vertices)
+        ico_triangles = get_triangular_faces(ico_vertices, ico_edges)
+        return ico_vertices, ico_edges, ico_triangles
+    
+    if name == 'dodecahedron':
+        # Dodecahedron (simplified - use icosahedron dual)
+        ico_vertices, _, ico_triangles = platonic_solid_data('icosahedron')
+        dod_vertices = []
+        for a, b, c in ico_triangles:
+            center = normalize((ico_vertices[a] + ico_vertices[b] + ico_vertices[c]) / 3.0)
+            dod_vertices.append(center)
+        dod_vertices = unique_rows(np.array(dod_vertices))
+        dod_edges = edges_from_vertices(dod_vertices)
+        dod_triangles = []  # Dodecahedron has pentagonal faces, no triangles
+        return dod_vertices, dod_edges, dod_triangles
     
-    return sorted(tuple(sorted(e)) for e in edges)
+    raise ValueError(f"Unknown Platonic solid: {name}")
+
+def pairwise_sq_distances(vertices):
+    """Matrix of squared Euclidean distances between all vertex pairs."""
+    V = np.asarray(vertices, dtype=float)
+    sq = np.einsum('ij,ij->i', V, V)
+    d2 = sq[:, None] + sq[None, :] - 2.0 * (V @ V.T)
+    np.maximum(d2, 0.0, out=d2)
+    return d2
+
+def edges_from_vertices(vertices, tol=1e-6):
+    """Find edges as minimal distance pairs (within ``tol`` of the minimum)."""
+    d2 = pairwise_sq_distances(vertices)
+    np.fill_diagonal(d2, np.inf)
+    min_d = math.sqrt(d2.min())
+    i, j = np.nonzero(d2 < (min_d + tol) ** 2)
+    # np.nonzero walks rows in order, so the pairs come out sorted
+    keep = i < j
+    return list(zip(i[keep].tolist(), j[keep].tolist()))
 
 def get_triangular_faces(vertices, edges):
-    """Find triangular faces from vertices and edges."""
-    edge_set = set(tuple(sorted(e)) for e in edges)
-    triangles = []
+    """Find triangular faces from vertices and edges.
+
+    Each edge (i, j) closes a triangle with every common neighbour k > j,
+    so the work is proportional to the edges times the vertex degree.
+    """
+    neighbors = [set() for _ in range(len(vertices))]
+    for a, b in edges:
+        neighbors[a].add(b)
+        neighbors[b].add(a)
     
-    n = len(vertices)
-    for i in range(n):
-        for j in range(i + 1, n):
-            for k in range(j + 1, n):
-                if (tuple(sorted((i, j))) in edge_set and
-                    tuple(sorted((j, k))) in edge_set and
-                    tuple(sorted((k, i))) in edge_set):
-                    triangles.append((i, j, k))
+    triangles = []
+    for a, b in edges:
+        i, j = min(a, b), max(a, b)
+        triangles.extend((i, j, k) for k in neighbors[i] & neighbors[j] if k > j)
     
     return sorted(triangles)
 
 def unique_rows(a, tol=1e-8):
-    """Remove duplicate rows from array."""
-    out = []
-    for r in a:
-        if not any(np.allclose(r, q, atol=tol) for q in out):
-            out.append(r)
-    return np.array(out)
+    """Remove duplicate rows from array.
+
+    Rows count as duplicates under np.allclose(atol=tol). They are hashed
+    into grid cells twice as wide as that tolerance, so a duplicate of a row
+    can only sit in its own cell or the neighbour on the nearer side in each
+    coordinate: 2^d lookups per row instead of a scan of all kept rows.
+    """
+    a = np.asarray(a, dtype=float)
+    if len(a) == 0:
+        return np.array([])
+    bound = tol + 1e-5 * np.abs(a).max()  # largest np.allclose tolerance
+    scaled = a / (2 * bound)
+    keys = np.floor(scaled)
+    sides = np.where(scaled - keys < 0.5, -1, 1).tolist()
+    keys = keys.astype(np.int64).tolist()
+    bumps = list(itertools.product((0, 1), repeat=a.shape[1]))
+    buckets = {}
+    kept = []
+    for idx, (r, key, side) in enumerate(zip(a.tolist(), keys, sides)):
+        duplicate = False
+        for bump in bumps:
+            cell = tuple(k + b * s for k, b, s in zip(key, bump, side))
+            for q in buckets.get(cell, ()):
+                if all(abs(x - y) <= tol + 1e-5 * abs(y) for x, y in zip(r, q)):
+                    duplicate = True
+                    break
+            if duplicate:
+                break
+        if not duplicate:
+            kept.append(idx)
+            buckets.setdefault(tuple(key), []).append(r)
+    return a[kept]
+
+def convex_hull_faces(vertices, tol=1e-7):
+    """Faces of the convex hull of points in convex position.
+
+    Every triple of points spans a candidate plane; the planes with all
+    points on one side are faces, and the points on such a plane form one
+    face, so coplanar triangles merge into a polygon. Faces are vertex
+    cycles ordered counterclockwise seen from outside. O(n^3) work, done
+    one first vertex at a time with NumPy, which is fine for the few
+    hundred vertices of the solids counted here.
+    """
+    V = np.asarray(vertices, dtype=float)
+    n = len(V)
+    center = V.mean(axis=0)
+    eps = tol * max(1.0, np.abs(V - center).max())
+    faces = {}
+    for i in range(n - 2):
+        j, k = np.triu_indices(n - i - 1, 1)
+        j += i + 1
+        k += i + 1
+        normals = np.cross(V[j] - V[i], V[k] - V[i])
+        norms = np.linalg.norm(normals, axis=1)
+        keep = norms > eps
+        normals = normals[keep] / norms[keep, None]
+        # Orient every plane away from the centroid
+        normals[normals @ (V[i] - center) < 0] *= -1
+        side = V @ normals.T - normals @ V[i]
+        for col in np.nonzero((side <= eps).all(axis=0))[0]:
+            members = frozenset(np.nonzero(side[:, col] > -eps)[0].tolist())
+            if members not in faces:
+                faces[members] = normals[col]
+    
+    ordered = []
+    for members, normal in faces.items():
+        members = sorted(members)
+        face_center = V[members].mean(axis=0)
+        e1 = normalize(V[members[0]] - face_center)
+        e2 = np.cross(normal, e1)
+        d = V[members] - face_center
+        ordered.append([members[i] for i in np.argsort(np.arctan2(d @ e2, d @ e1))])
+    used = {v for face in ordered for v in face}
+    if len(used) != n:
+        raise ValueError(f"{n - len(used)} points are not vertices of their convex hull")
+    return sorted(ordered)
+
+def polyhedron_from_faces(vertices, faces):
+    """(vertices, edges, triangles) of a polyhedron given by its faces.
+
+    Edges are the sides of the faces; the triangle filter gets the faces
+    with three vertices. Every edge has to border exactly two faces.
+    """
+    V = np.asarray(vertices, dtype=float)
+    sides = Counter()
+    for face in faces:
+        for a, b in zip(face, list(face[1:]) + [face[0]]):
+            sides[(min(a, b), max(a, b))] += 1
+    open_edges = [e for e, count in sides.items() if count != 2]
+    if open_edges:
+        raise ValueError(f"Not a closed polyhedron: edge {open_edges[0]} borders "
+                         f"{sides[open_edges[0]]} faces")
+    if {v for e in sides for v in e} != set(range(len(V))):
+        raise ValueError("Every vertex has to lie on a face")
+    edges = sorted(sides)
+    triangles = sorted(tuple(sorted(face)) for face in faces if len(face) == 3)
+    return V, edges, triangles
+
+def polyhedron_from_vertices(vertices):
+    """(vertices, edges, triangles) of the convex hull of the given points."""
+    return polyhedron_from_faces(vertices, convex_hull_faces(vertices))
+
+def dual_vertices(vertices, faces):
+    """Vertices of the polar dual: one per face, at the pole of its plane
+    with respect to a sphere around the centroid."""
+    V = np.asarray(vertices, dtype=float)
+    center = V.mean(axis=0)
+    poles = []
+    for face in faces:
+        normal = normalize(np.cross(V[face[1]] - V[face[0]], V[face[2]] - V[face[0]]))
+        offset = normal @ (V[face[0]] - center)
+        if offset < 0:
+            normal, offset = -normal, -offset
+        poles.append(center + normal / offset)
+    return np.array(poles)
+
+def signed_permutations(base, even=False):
+    """All sign changes of the nonzero coordinates of ``base`` under all (or
+    only the even) coordinate permutations, duplicates removed."""
+    perms = [p for p in itertools.permutations(range(3))
+             if not even or sum(p[a] > p[b] for a in range(3) for b in range(a + 1, 3)) % 2 == 0]
+    points = []
+    for signs in itertools.product((1, -1), repeat=3):
+        point = [s * c for s, c in zip(signs, base)]
+        points.extend([point[p[0]], point[p[1]], point[p[2]]] for p in perms)
+    return unique_rows(np.array(points))
+
+def _archimedean(*groups):
+    """Vertices from (base point, even permutations only) groups."""
+    return np.concatenate([signed_permutations(base, even) for base, even in groups])
+
+def shape_vertices(name):
+    """Vertex coordinates of a named shape: an Archimedean solid, a Platonic
+    solid, prismN / antiprismN, or dual-NAME for the polar dual (Catalan
+    solids, bipyramids, trapezohedra)."""
+    phi = (1 + 5**0.5) / 2
+    r2 = 2**0.5
+    if name.startswith('dual-'):
+        vertices = shape_vertices(name[len('dual-'):])
+        return dual_vertices(vertices, convex_hull_faces(vertices))
+    for prefix in ('antiprism', 'prism'):
+        if name.startswith(prefix) and name[len(prefix):].isdigit():
+            k = int(name[len(prefix):])
+            if k < 3:
+                raise ValueError(f"{name}: need at least 3 sides")
+            side = 2 * math.sin(math.pi / k)
+            if prefix == 'prism':
+                twist, half_height = 0.0, side / 2
+            else:
+                twist = math.pi / k
+                half_height = math.sqrt(side**2 - (2 * math.sin(math.pi / (2 * k)))**2) / 2
+            angles = 2 * math.pi * np.arange(k) / k
+            ring = lambda a, z: np.column_stack([np.cos(a), np.sin(a), np.full(k, z)])
+            return np.concatenate([ring(angles, half_height), ring(angles + twist, -half_height)])
+    shapes = {
+        'truncated-tetrahedron': lambda: unique_rows(np.array(
+            [p for p in signed_permutations((3, 1, 1)) if np.prod(np.sign(p)) > 0])),
+        'cuboctahedron': lambda: _archimedean(((1, 1, 0), False)),
+        'truncated-cube': lambda: _archimedean(((r2 - 1, 1, 1), False)),
+        'truncated-octahedron': lambda: _archimedean(((0, 1, 2), False)),
+        'rhombicuboctahedron': lambda: _archimedean(((1, 1, 1 + r2), False)),
+        'truncated-cuboctahedron': lambda: _archimedean(((1, 1 + r2, 1 + 2 * r2), False)),
+        'icosidodecahedron': lambda: _archimedean(
+            ((0, 0, phi), False), ((0.5, phi / 2, phi**2 / 2), True)),
+        'truncated-dodecahedron': lambda: _archimedean(
+            ((0, 1 / phi, 2 + phi), True), ((1 / phi, phi, 2 * phi), True),
+            ((phi, 2, phi + 1), True)),
+        'truncated-icosahedron': lambda: _archimedean(
+            ((0, 1, 3 * phi), True), ((1, 2 + phi, 2 * phi), True), ((phi, 2, phi**3), True)),
+        'rhombicosidodecahedron': lambda: _archimedean(
+            ((1, 1, phi**3), True), ((phi**2, phi, 2 * phi), True), ((2 + phi, 0, phi**2), True)),
+        'truncated-icosidodecahedron': lambda: _archimedean(
+            ((1 / phi, 1 / phi, 3 + phi), True), ((2 / phi, phi, 1 + 2 * phi), True),
+            ((1 / phi, phi**2, 3 * phi - 1), True), ((2 * phi - 1, 2, 2 + phi), True),
+            ((phi, 3, 2 * phi), True)),
+    }
+    if name in shapes:
+        return shapes[name]()
+    if name in PLATONIC_SOLIDS:
+        return platonic_solid_data(name)[0]
+    raise ValueError(f"Unknown shape: {name} (known: {', '.join(sorted(shapes))}, "
+                     f"prismN, antiprismN, the Platonic solids, dual-NAME)")
+
+def read_polyhedron_file(path):
+    """Vertices and faces from an OFF or OBJ file.
+
+    Any other file is read as one "x y z" vertex per line, and faces are
+    None (to be taken from the convex hull). ``#`` starts a comment.
+    """
+    with open(path) as f:
+        lines = [line.split('#', 1)[0].split() for line in f]
+    lines = [tokens for tokens in lines if tokens]
+    if not lines:
+        raise ValueError(f"{path}: no vertices")
+    
+    if lines[0][0].upper() == 'OFF':
+        header = lines[0][1:] or lines[1]
+        body = lines[1:] if lines[0][1:] else lines[2:]
+        nv, nf = int(header[0]), int(header[1])
+        vertices = [[float(x) for x in tokens[:3]] for tokens in body[:nv]]
+        faces = [[int(v) for v in tokens[1:1 + int(tokens[0])]] for tokens in body[nv:nv + nf]]
+        return np.array(vertices), faces
+    
+    if any(tokens[0] in ('v', 'f') for tokens in lines):
+        vertices = [[float(x) for x in tokens[1:4]] for tokens in lines if tokens[0] == 'v']
+        faces = []
+        for tokens in lines:
+            if tokens[0] == 'f':
+                # "f 1/1/1 2/2/2 ..." with 1-based (or negative, relative) indices
+                indices = [int(t.split('/')[0]) for t in tokens[1:]]
+                faces.append([i - 1 if i > 0 else len(vertices) + i for i in indices])
+        return np.array(vertices), faces or None
+    
+    return np.array([[float(x) for x in tokens[:3]] for tokens in lines]), None
+
+def load_polyhedron(spec):
+    """(name, (vertices, edges, triangles)) for a polyhedron file or a
+    shape_vertices name, ready for burnside_counts_optimized."""
+    if os.path.exists(spec):
+        vertices, faces = read_polyhedron_file(spec)
+        name = os.path.splitext(os.path.basename(spec))[0]
+        if faces is None:
+            return name, polyhedron_from_vertices(vertices)
+        return name, polyhedron_from_faces(vertices, faces)
+    return spec, polyhedron_from_vertices(shape_vertices(spec))
 
 def generate_rotation_group_fast(vertices, max_rotations=120):
-    """Fast rotation group generation using optimized search."""
+    """Rotation group from an axis-angle search over vertex and edge axes.
+
+    All candidates are evaluated at once with vertex_perms_from_rotations.
+    """
     n = len(vertices)
     V = np.array(vertices)
     perms = [tuple(range(n))]  # Identity
     
-    def vperm_from_R(R):
-        perm = [None] * n
-        rotated = R @ V.T
-        for i in range(n):
-            j = nearest_index(rotated[:, i], V)
-            if j is None:
-                return None
-            perm[i] = j
-        return tuple(perm)
-    
     # Optimized axis generation
     axes = []
     # Vertex directions
     axes.extend([normalize(v) for v in V])
-    # Edge midpoints (only for close vertices)
+    # Edge midpoints (only for close vertices; antipodal pairs have no axis
+    # and would turn rot_axis_angle into the improper -I)
     for i in range(n):
         for j in range(i + 1, n):
-            if np.linalg.norm(V[i] - V[j]) < 2.5:
+            if np.linalg.norm(V[i] - V[j]) < 2.5 and np.linalg.norm(V[i] + V[j]) > 1e-6:
                 axes.append(normalize((V[i] + V[j]) / 2))
     
     # Common angles for Platonic solids
     angles = [math.pi/6, math.pi/3, math.pi/2, 2*math.pi/3, math.pi, 
               4*math.pi/3, 3*math.pi/2, 2*math.pi/5, 4*math.pi/5]
     
-    for axis in axes:
-        for angle in angles:
-            if len(perms) >= max_rotations:
-                break
-            R = rot_axis_angle(axis, angle)
-            p = vperm_from_R(R)
-            if p is not None and p not in perms:
-                perms.append(p)
+    rotations = rot_axis_angle_batch(np.repeat(axes, len(angles), axis=0),
+                                     np.tile(angles, len(axes)))
+    seen = set(perms)
+    for p in vertex_perms_from_rotations(V, rotations):
         if len(perms) >= max_rotations:
             break
+        if p is not None and p not in seen:
+            seen.add(p)
+            perms.append(p)
     
+    # The axis search can miss rotations (e.g. face axes); close the set so
+    # Burnside sums and conjugacy classes run over a genuine group
+    return close_permutation_group(perms)
+
+def vertex_rotation_system(vertices, edges):
+    """Neighbours of every vertex in counterclockwise order seen from outside.
+
+    The outward direction at a vertex is taken away from the centroid, which
+    is right for any convex polyhedron. This is the only floating-point step
+    of the graph-based group construction.
+    """
+    V = np.asarray(vertices, dtype=float)
+    center = V.mean(axis=0)
+    neighbors = [[] for _ in range(len(V))]
+    for a, b in edges:
+        neighbors[a].append(b)
+        neighbors[b].append(a)
+    
+    rotation = []
+    for v, nbrs in enumerate(neighbors):
+        if len(nbrs) < 3:
+            raise ValueError(f"Vertex {v} has {len(nbrs)} neighbours; not a polyhedron")
+        normal = normalize(V[v] - center)
+        d = V[nbrs] - V[v]
+        d -= np.outer(d @ normal, normal)
+        e1 = normalize(d[0])
+        e2 = np.cross(normal, e1)
+        rotation.append([nbrs[i] for i in np.argsort(np.arctan2(d @ e2, d @ e1))])
+    return rotation
+
+def _extend_flag(rotation, positions, source, target):
+    """Vertex permutation sending directed edge ``source`` to ``target`` and
+    keeping every vertex's counterclockwise neighbour order, or None."""
+    n = len(rotation)
+    perm = [-1] * n
+    used = [False] * n
+    (a, b), (a2, b2) = source, target
+    perm[a] = a2
+    used[a2] = True
+    stack = [(a, b, a2, b2)]
+    while stack:
+        a, b, a2, b2 = stack.pop()
+        ring, ring2 = rotation[a], rotation[a2]
+        k = len(ring)
+        if len(ring2) != k:
+            return None
+        i, j = positions[a][b], positions[a2][b2]
+        for t in range(k):
+            c, c2 = ring[(i + t) % k], ring2[(j + t) % k]
+            if perm[c] < 0:
+                if used[c2]:
+                    return None
+                perm[c] = c2
+                used[c2] = True
+                stack.append((c, a, c2, a2))
+            elif perm[c] != c2:
+                return None
+    return tuple(perm) if all(used) else None
+
+def geometric_rotations(vertices, vertex_perms, tol=1e-6):
+    """The permutations realised by a proper rotation of the (centred)
+    vertex coordinates, in their original order."""
+    X = np.asarray(vertices, dtype=float)
+    X = X - X.mean(axis=0)
+    tol = tol * max(1.0, np.abs(X).max())
+    pinv = np.linalg.pinv(X)
+    kept = []
+    for perm in vertex_perms:
+        Y = X[list(perm)]
+        R = (pinv @ Y).T
+        if (np.allclose(R.T @ R, np.eye(3), atol=tol) and np.linalg.det(R) > 0
+                and np.allclose(X @ R.T, Y, atol=tol)):
+            kept.append(perm)
+    return kept
+
+def verify_rotation_group(vertices, vertex_perms, tol=1e-6):
+    """Raise ValueError unless every permutation is realised by a proper
+    rotation of the (centred) vertex coordinates."""
+    realised = set(map(tuple, geometric_rotations(vertices, vertex_perms, tol)))
+    for perm in vertex_perms:
+        if tuple(perm) not in realised:
+            raise ValueError(f"Vertex permutation {tuple(perm)} is not a rotation of the solid")
+
+def rotation_group_from_graph(vertices, edges, verify=False):
+    """Rotation group as the orientation-preserving automorphisms of the
+    vertex-edge graph.
+
+    A flag (vertex 0 and its first neighbour) is anchored and sent to every
+    directed edge in turn; the map is propagated around each reached vertex
+    in counterclockwise order and rejected on the first clash. The result
+    is exact, starts with the identity and needs no hand-picked axes or
+    generators. With ``verify`` every permutation is also checked to be a
+    proper rotation of the coordinates, which fails for irregular
+    realisations of a symmetric graph.
+    """
+    rotation = vertex_rotation_system(vertices, edges)
+    positions = [{u: i for i, u in enumerate(ring)} for ring in rotation]
+    source = (0, rotation[0][0])
+    targets = [source] + [(v, u) for v, ring in enumerate(rotation) for u in ring
+                          if (v, u) != source]
+    perms = []
+    for target in targets:
+        perm = _extend_flag(rotation, positions, source, target)
+        if perm is not None:
+            perms.append(perm)
+    if verify:
+        verify_rotation_group(vertices, perms)
     return perms
 
+GROUP_METHODS = ('graph', 'search')
+
+def build_rotation_group(vertices, edges, method='graph', verify=False, geometric=False):
+    """Vertex permutations of the rotation group.
+
+    ``graph`` uses rotation_group_from_graph; ``search`` the axis-angle
+    search of generate_rotation_group_fast. With ``geometric`` graph
+    automorphisms that are no rotation of the coordinates are dropped, for
+    solids that are less symmetric than their graph (a stretched prism).
+    """
+    if method == 'graph':
+        perms = rotation_group_from_graph(vertices, edges)
+    elif method == 'search':
+        perms = generate_rotation_group_fast(vertices)
+    else:
+        raise ValueError(f"Unknown group method: {method}")
+    if geometric:
+        perms = geometric_rotations(vertices, perms)
+    if verify:
+        verify_rotation_group(vertices, perms)
+    return perms
+
+def close_permutation_group(perms):
+    """Smallest set of permutations containing perms and closed under composition.
+
+    The generators become one integer array; every BFS level is composed with
+    all of them in a single np.take and new elements are recognised by their
+    row bytes in a hash set. Groups of several thousand elements (the 7200
+    rotations of the 600-cell) close in well under a second.
+    """
+    if len(perms) == 0:
+        return []
+    gens = np.array(perms, dtype=np.int32)
+    n = gens.shape[1]
+    row_bytes = n * gens.itemsize
+    
+    seen = set()
+    levels = []
+    frontier = []
+    for row in gens:
+        key = row.tobytes()
+        if key not in seen:
+            seen.add(key)
+            frontier.append(row)
+    frontier = np.array(frontier)
+    while len(frontier):
+        levels.append(frontier)
+        # products[a, b] = a composed with generator b, i.e. a[b[i]]
+        products = np.take(frontier, gens, axis=1).reshape(-1, n)
+        raw = products.tobytes()
+        new = []
+        for k in range(len(products)):
+            key = raw[k * row_bytes:(k + 1) * row_bytes]
+            if key not in seen:
+                seen.add(key)
+                new.append(k)
+        frontier = products[new]
+    return [tuple(p) for p in np.concatenate(levels).tolist()]
+
+def conjugacy_class_members(perms):
+    """Partition a permutation group into conjugacy classes.
+
+    Returns one member list per class, led by its first member in ``perms``
+    order.
+    """
+    group = [tuple(p) for p in perms]
+    members = set(group)
+    assigned = set()
+    classes = []
+    for h in group:
+        if h in assigned:
+            continue
+        cls = set()
+        for g in group:
+            conj = [None] * len(h)
+            for i in range(len(h)):
+                conj[g[i]] = g[h[i]]
+            conj = tuple(conj)
+            if conj not in members:
+                raise ValueError("Permutations are not closed under conjugation; not a group")
+            cls.add(conj)
+        assigned |= cls
+        classes.append([h] + sorted(cls - {h}))
+    return classes
+
 def edge_perms_from_vperms(edges, vertex_perms):
     """Convert vertex permutations to edge permutations."""
     edge_to_idx = {tuple(sorted(e)): i for i, e in enumerate(edges)}
@@ -441,68 +2097,339 @@ def edge_perms_from_vperms(edges, vertex_perms):
     
     return edge_perms
 
+SOLID_PACK_VERSION = 2
+SOLID_PACK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'solid_packs')
+SOLID_PACK_ARRAYS = ('vertices', 'edges', 'triangles', 'vertex_perms', 'edge_perms',
+                     'class_ids', 'representatives', 'weights', 'cycle_edges', 'cycle_starts')
+
+def pack_cycles(cycles, n_edges):
+    """Cycle decompositions as two (representatives, edges) arrays.
+
+    Row r of ``cycle_edges`` lists representative r's cycles one after
+    another, each in cycle order; ``cycle_starts`` marks the first edge of
+    every cycle.
+    """
+    cycle_edges = np.zeros((len(cycles), n_edges), dtype=np.int32)
+    cycle_starts = np.zeros((len(cycles), n_edges), dtype=bool)
+    for r, cycsets in enumerate(cycles):
+        cycle_edges[r] = [e for cyc in cycsets for e in cyc]
+        cycle_starts[r, np.cumsum([0] + [len(cyc) for cyc in cycsets[:-1]])] = True
+    return cycle_edges, cycle_starts
+
+def unpack_cycles(cycle_edges, cycle_starts):
+    """Per-representative cycle lists stored with pack_cycles."""
+    return [[cyc.tolist() for cyc in np.split(row, np.flatnonzero(starts)[1:])]
+            for row, starts in zip(np.asarray(cycle_edges), np.asarray(cycle_starts))]
+
+def solid_pack_key(vertices, edges, triangular_faces, group_method='graph'):
+    """Hash of everything a solid pack is derived from.
+
+    A pack stored under another key (other geometry, triangle filter, group
+    method or pack version) is stale.
+    """
+    V = np.round(np.asarray(vertices, dtype=float), 9) + 0.0  # no -0.0
+    return hashlib.sha256(repr((
+        SOLID_PACK_VERSION, group_method, V.tolist(),
+        [tuple(int(v) for v in e) for e in edges],
+        [tuple(int(v) for v in t) for t in triangular_faces])).encode()).hexdigest()
+
+def validate_solid_pack(pack):
+    """Consistency problem of a solid pack's arrays, or None.
+
+    Checks shapes, that both permutation tables hold permutations, that the
+    edge table is induced by the vertex table, that the representatives
+    are group elements whose weights add up to the group order, and that
+    the stored cycles are the cycles of the representatives.
+    """
+    V, E, vperms, eperms = (pack[k] for k in ('vertices', 'edges', 'vertex_perms', 'edge_perms'))
+    n, m, G = len(V), len(E), len(vperms)
+    if vperms.shape != (G, n) or eperms.shape != (G, m) or pack['class_ids'].shape != (G,):
+        return 'permutation tables do not match the geometry'
+    if len(pack['representatives']) != len(pack['weights']) or (
+            len(pack['representatives']) and pack['representatives'].shape[1] != m):
+        return 'representatives do not match the weights'
+    if not (np.array_equal(np.sort(vperms, axis=1), np.broadcast_to(np.arange(n), (G, n))) and
+            np.array_equal(np.sort(eperms, axis=1), np.broadcast_to(np.arange(m), (G, m)))):
+        return 'permutation tables hold non-permutations'
+    edge_index = np.full((n, n), -1, dtype=np.int64)
+    edge_index[E[:, 0], E[:, 1]] = edge_index[E[:, 1], E[:, 0]] = np.arange(m)
+    if not np.array_equal(edge_index[vperms[:, E[:, 0]], vperms[:, E[:, 1]]], eperms):
+        return 'edge permutations are not induced by the vertex permutations'
+    elements = {np.asarray(p, dtype=np.int64).tobytes() for p in eperms}
+    if any(np.asarray(p, dtype=np.int64).tobytes() not in elements for p in pack['representatives']):
+        return 'a representative is not a group element'
+    if int(np.sum(pack['weights'])) != G:
+        return 'weights do not add up to the group order'
+    reps, cycle_edges, cycle_starts = (
+        np.asarray(pack[k]) for k in ('representatives', 'cycle_edges', 'cycle_starts'))
+    R = len(reps)
+    if cycle_edges.shape != (R, m) or cycle_starts.shape != (R, m):
+        return 'cycle tables do not match the representatives'
+    if R and m:
+        # Each edge maps to the next one of its cycle, the last back to the first
+        pos = np.arange(m)
+        first = np.maximum.accumulate(np.where(cycle_starts, pos, 0), axis=1)
+        last = np.ones((R, m), dtype=bool)
+        last[:, :-1] = cycle_starts[:, 1:]
+        successor = np.where(last, first, pos + 1)
+        if not (cycle_starts[:, 0].all() and
+                np.array_equal(np.sort(cycle_edges, axis=1), np.broadcast_to(pos, (R, m))) and
+                np.array_equal(np.take_along_axis(reps, cycle_edges, axis=1),
+                               np.take_along_axis(cycle_edges, successor, axis=1))):
+            return 'cycles are not the cycles of the representatives'
+    return None
+
+def write_solid_pack(pack_dir, name, key, vertices, edges, triangular_faces, vertex_perms, state):
+    """Write one solid's pack: a directory of .npy arrays and meta.json.
+
+    It is written next to its final place and renamed over it, so readers
+    see either the old or the new pack.
+    """
+    path = os.path.join(pack_dir, name)
+    tmp = path + '.tmp'
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    arrays = {
+        'vertices': np.asarray(vertices, dtype=float),
+        'edges': np.asarray(edges, dtype=np.int32).reshape(-1, 2),
+        'triangles': np.asarray(triangular_faces, dtype=np.int32).reshape(-1, 3),
+        'vertex_perms': np.asarray(vertex_perms, dtype=np.int32),
+        'edge_perms': np.asarray(
+            edge_perms_from_vperms(edges, vertex_perms), dtype=np.int32).reshape(len(vertex_perms), -1),
+        'class_ids': np.asarray(state.class_ids, dtype=np.int32),
+        'representatives': np.asarray(state.representatives, dtype=np.int32).reshape(
+            len(state.representatives), -1),
+        'weights': np.asarray([w for _, w in state.items], dtype=np.int64),
+    }
+    arrays['cycle_edges'], arrays['cycle_starts'] = pack_cycles(
+        [cycsets for cycsets, _ in state.items], len(edges))
+    problem = validate_solid_pack(arrays)
+    if problem is not None:
+        raise ValueError(f"Refusing to write the {name} pack: {problem}")
+    for array_name, array in arrays.items():
+        np.save(os.path.join(tmp, array_name + '.npy'), array)
+    with open(os.path.join(tmp, 'meta.json'), 'w') as f:
+        json.dump({'version': SOLID_PACK_VERSION, 'solid': name, 'key': key,
+                   'group_order': len(vertex_perms), 'n_classes': state.n_classes}, f, indent=2)
+    old = path + '.old'
+    if os.path.exists(path):
+        shutil.rmtree(old, ignore_errors=True)
+        os.replace(path, old)
+    os.replace(tmp, path)
+    shutil.rmtree(old, ignore_errors=True)
+    return path
+
+def load_solid_pack(pack_dir, name, key):
+    """Memory-map one solid's pack.
+
+    Returns (arrays, None), or (None, reason) when the pack is missing,
+    stale or fails validate_solid_pack; the caller then recomputes.
+    """
+    path = os.path.join(pack_dir, name)
+    try:
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None, 'missing'
+    if meta.get('version') != SOLID_PACK_VERSION or meta.get('key') != key:
+        return None, 'stale'
+    try:
+        pack = {k: np.load(os.path.join(path, k + '.npy'), mmap_mode='r')
+                for k in SOLID_PACK_ARRAYS}
+    except (OSError, ValueError) as e:
+        return None, f'unreadable ({e})'
+    problem = validate_solid_pack(pack)
+    if problem is not None:
+        return None, f'invalid ({problem})'
+    return pack, None
+
 def main():
     """Main execution function."""
     parser = argparse.ArgumentParser(description='Optimized Platonic Solids Counter')
     parser.add_argument('--workers', type=int, default=None, 
                        help='Number of worker processes (default: auto)')
-    parser.add_argument('--solids', type=str, 
-                       default='tetrahedron,cube,octahedron,icosahedron,dodecahedron',
-                       help='Comma-separated list of solids to compute')
+    parser.add_argument('--solids', type=str, default=None,
+                       help='Comma-separated list of Platonic solids to compute (default: all '
+                            'five, or none when --polyhedron is given)')
+    parser.add_argument('--polyhedron', action='append', default=[],
+                       help='Also count a convex polyhedron: an OFF/OBJ file, a file of '
+                            '"x y z" vertex lines, or a shape name such as prism6, '
+                            'truncated-icosahedron or dual-cuboctahedron (repeatable)')
+    parser.add_argument('--engine', choices=ENGINES, default='frontier',
+                       help='Counting engine for fixed subsets (default: frontier)')
+    parser.add_argument('--backend', choices=BACKENDS, default=None,
+                       help='Executor for work units (default: thread on free-threaded '
+                            'Python builds, process otherwise)')
+    parser.add_argument('--group', choices=GROUP_METHODS, default='graph',
+                       help='Rotation group construction: graph automorphisms (default) '
+                            'or axis-angle search')
+    parser.add_argument('--verify-group', action='store_true',
+                       help='Check that every group element is a proper rotation of the coordinates')
+    parser.add_argument('--packs', type=str, default=SOLID_PACK_DIR,
+                       help='Directory of precompiled solid packs (default: solid_packs '
+                            'next to this script); missing or stale packs are recomputed')
+    parser.add_argument('--no-packs', action='store_true',
+                       help='Ignore solid packs and recompute groups and classes')
+    parser.add_argument('--build-packs', action='store_true',
+                       help='Write solid packs for --solids into --packs and exit')
+    parser.add_argument('--checkpoint', type=str, default=None,
+                       help='Record finished work units in this file')
+    parser.add_argument('--checkpoint-interval', type=float, default=60.0,
+                       help='Seconds between checkpoint writes (default: 60)')
+    parser.add_argument('--resume', action='store_true',
+                       help='Skip work units already recorded in the checkpoint file')
+    parser.add_argument('--cache', type=str, default=None,
+                       help='SQLite file caching fixed-subset counts between runs')
+    parser.add_argument('--predicate-cache-mb', type=float, default=0,
+                       help='Per-worker LRU cache of mask predicates for the enumerate '
+                            'engine, in MB (default: off)')
+    parser.add_argument('--progress', choices=('bar', 'quiet'), default='bar',
+                       help='Progress output: messages and a work-unit bar, or nothing')
+    parser.add_argument('--metrics-jsonl', type=str, default=None,
+                       help='Append timing, counter and progress events to this JSON lines file')
+    parser.add_argument('--split-square-faces', action='store_true',
+                       help="Also filter the cube's square faces (given as split triangles)")
     
     args = parser.parse_args()
+    if args.resume and args.checkpoint is None:
+        parser.error('--resume requires --checkpoint')
+    if args.predicate_cache_mb > 0 and args.engine != 'enumerate':
+        parser.error('--predicate-cache-mb requires --engine enumerate')
     
     if args.workers is None:
         args.workers = cpu_count()
     
-    print(f"Using {args.workers} worker processes")
+    if args.backend is None:
+        args.backend = default_backend()
+    if args.workers <= 1:
+        args.backend = 'serial'
     
-    # Get solid data
-    solid_data = get_platonic_solid_data()
-    requested_solids = [s.strip() for s in args.solids.split(',')]
+    sinks = [ProgressSink() if args.progress == 'bar' else QuietSink()]
+    if args.metrics_jsonl is not None:
+        sinks.append(JsonLinesSink(args.metrics_jsonl))
+    instrumentation = Instrumentation(sinks)
+    message = instrumentation.message
     
-    results = {}
+    message(f"Using {args.workers} workers ({args.backend} backend)")
+    
+    # Get solid data
+    with instrumentation.phase('geometry'):
+        solid_data = get_platonic_solid_data(split_square_faces=args.split_square_faces)
+    if args.solids is None:
+        args.solids = '' if args.polyhedron else 'tetrahedron,cube,octahedron,icosahedron,dodecahedron'
+    requested_solids = [s.strip() for s in args.solids.split(',') if s.strip()]
+    custom = set()
+    for spec in args.polyhedron:
+        with instrumentation.phase('geometry', solid=spec):
+            name, data = load_polyhedron(spec)
+        solid_data[name] = data
+        custom.add(name)
+        requested_solids.append(name)
     
+    # Rotation groups and per-solid states first, so that one executor
+    # created with all of them serves the whole run (its workers start on
+    # the first dispatched unit)
+    prepared = {}
     for solid_name in requested_solids:
         if solid_name not in solid_data:
             print(f"Unknown solid: {solid_name}")
             continue
         
-        print(f"\n{'='*50}")
-        print(f"Processing {solid_name.capitalize()}")
-        print(f"{'='*50}")
-        
         vertices, edges, triangles = solid_data[solid_name]
-        
-        # Generate rotation group
-        print(f"Generating rotation group...")
-        vertex_perms = generate_rotation_group_fast(vertices)
-        edge_perms = edge_perms_from_vperms(edges, vertex_perms)
-        
-        print(f"  Vertices: {len(vertices)}")
-        print(f"  Edges: {len(edges)}")
-        print(f"  Rotations: {len(edge_perms)}")
-        print(f"  Triangular faces: {len(triangles)}")
-        
-        # Compute counts
-        start_time = time.time()
-        all_count, conn_count, valid_count = burnside_counts_optimized(
-            vertices, edges, edge_perms, triangles, solid_name.capitalize(), args.workers
-        )
-        elapsed = time.time() - start_time
-        
-        results[solid_name.capitalize()] = {
-            "V": len(vertices),
-            "E": len(edges), 
-            "G": len(edge_perms),
-            "Triangular Faces": len(triangles),
-            "All Combinations": all_count,
-            "All Connected": conn_count,
-            "Valid Incomplete": valid_count,
-            "Time (seconds)": f"{elapsed:.1f}"
-        }
-        
-        print(f"Completed in {elapsed:.1f} seconds")
+        if (args.engine == 'vertex' and not args.build_packs
+                and len(vertices) > VERTEX_ENGINE_MAX_VERTICES):
+            parser.error(f"--engine vertex supports at most {VERTEX_ENGINE_MAX_VERTICES} vertices; "
+                         f"{solid_name} has {len(vertices)}")
+        key = solid_pack_key(vertices, edges, triangles, args.group)
+        pack, reason = None, 'disabled'
+        if not (args.no_packs or args.build_packs):
+            pack, reason = load_solid_pack(args.packs, solid_name, key)
+        if pack is not None:
+            message(f"Loaded {solid_name} pack from {args.packs}")
+            with instrumentation.phase('group', solid=solid_name):
+                vertex_perms = pack['vertex_perms']
+                edge_perms = pack['edge_perms']
+            with instrumentation.phase('cycles', solid=solid_name):
+                state = SolidState(vertices, edges, edge_perms, triangles, args.predicate_cache_mb,
+                                   classes=(pack['class_ids'], pack['representatives'],
+                                            pack['weights']),
+                                   cycles=unpack_cycles(pack['cycle_edges'], pack['cycle_starts']))
+        else:
+            if reason not in ('disabled', 'missing'):
+                message(f"Solid pack for {solid_name} {reason}; recomputing "
+                        f"(--build-packs writes a new one)")
+            message(f"Generating rotation group for {solid_name}...")
+            with instrumentation.phase('group', solid=solid_name):
+                vertex_perms = build_rotation_group(vertices, edges, args.group, args.verify_group,
+                                                    geometric=solid_name in custom)
+                edge_perms = edge_perms_from_vperms(edges, vertex_perms)
+            with instrumentation.phase('cycles', solid=solid_name):
+                state = SolidState(vertices, edges, edge_perms, triangles, args.predicate_cache_mb)
+        if args.build_packs:
+            path = write_solid_pack(args.packs, solid_name, key, vertices, edges, triangles,
+                                    vertex_perms, state)
+            message(f"Wrote {path}")
+            continue
+        prepared[solid_name] = (vertices, edges, edge_perms, triangles, state)
+    
+    if args.build_packs:
+        instrumentation.close()
+        return
+    
+    states = {name: p[-1] for name, p in prepared.items()}
+    executor = LazyExecutor(args.backend, args.workers, states)
+    cache = ResultCache(args.cache) if args.cache is not None else None
+    checkpoint = None
+    if args.checkpoint is not None:
+        checkpoint = Checkpoint(args.checkpoint, args.checkpoint_interval, resume=args.resume)
+    
+    results = {}
+    
+    try:
+        for solid_name, (vertices, edges, edge_perms, triangles, state) in prepared.items():
+            message(f"\n{'='*50}")
+            message(f"Processing {solid_name.capitalize()}")
+            message(f"{'='*50}")
+            
+            message(f"  Vertices: {len(vertices)}")
+            message(f"  Edges: {len(edges)}")
+            message(f"  Rotations: {len(edge_perms)}")
+            message(f"  Triangular faces: {len(triangles)}")
+            
+            # Compute counts
+            start_time = time.time()
+            all_count, conn_count, valid_count = burnside_counts_optimized(
+                vertices, edges, edge_perms, triangles, solid_name.capitalize(), args.workers,
+                engine=args.engine, executor=executor, solid_id=solid_name,
+                checkpoint=checkpoint, cache=cache, instrumentation=instrumentation
+            )
+            elapsed = time.time() - start_time
+            
+            results[solid_name.capitalize()] = {
+                "V": len(vertices),
+                "E": len(edges), 
+                "G": len(edge_perms),
+                "Triangular Faces": len(triangles),
+                "All Combinations": all_count,
+                "All Connected": conn_count,
+                "Valid Incomplete": valid_count,
+                "Time (seconds)": f"{elapsed:.1f}"
+            }
+            if state.predicate_cache is not None:
+                counters = instrumentation.solid_counters[solid_name]
+                results[solid_name.capitalize()]["Predicate Cache Hits"] = counters['predicate_cache_hits']
+                results[solid_name.capitalize()]["Predicate Cache Misses"] = counters['predicate_cache_misses']
+            
+            message(f"Completed in {elapsed:.1f} seconds")
+    except BaseException:
+        shutdown_executor(executor, failed=True)
+        raise
+    else:
+        shutdown_executor(executor, failed=False)
+    finally:
+        if cache is not None:
+            cache.close()
+        instrumentation.close()
     
     # Display results
     print(f"\n{'='*80}")